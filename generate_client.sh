@@ -1 +1,37 @@
-openapi-python-client generate --url http://<url>/openapi.json --output-path openwebui/open_web_ui_client --overwrite --meta uv
\ No newline at end of file
+#!/bin/bash
+# Regenerates the low-level OpenAPI client under openwebui/open_web_ui_client.
+#
+# A few generated files carry hand-applied performance edits (module-level field parsers,
+# to_json_bytes, UserModel.from_list, ...). `--overwrite` would silently discard
+# them, so they are restored from git after generating; the generator's version of those files is
+# saved as a diff so schema changes can be ported into them by hand.
+#
+# Usage: ./generate_client.sh http://your-openwebui-instance:8080/openapi.json
+set -euo pipefail
+
+OPENAPI_URL="${1:?usage: $0 <openapi.json URL>}"
+CLIENT_DIR=openwebui/open_web_ui_client
+PKG_DIR="$CLIENT_DIR/open_web_ui_client"
+HAND_TUNED=(
+    "$PKG_DIR/types.py"
+    "$PKG_DIR/models/session_user_info_response.py"
+    "$PKG_DIR/models/sync_models_form.py"
+    "$PKG_DIR/models/update_profile_form.py"
+    "$PKG_DIR/models/user_list_response.py"
+    "$PKG_DIR/models/user_model.py"
+)
+REGEN_DIFF="${TMPDIR:-/tmp}/open_web_ui_client_hand_tuned.diff"
+
+# The hand-tuned files are restored from HEAD, so uncommitted edits to them would be lost
+if ! git diff --quiet HEAD -- "${HAND_TUNED[@]}"; then
+    echo "Commit or stash your changes to the hand-tuned client files first:" >&2
+    printf '  %s\n' "${HAND_TUNED[@]}" >&2
+    exit 1
+fi
+
+openapi-python-client generate --url "$OPENAPI_URL" --output-path "$CLIENT_DIR" --overwrite --meta uv
+
+git diff HEAD -- "${HAND_TUNED[@]}" > "$REGEN_DIFF"
+git checkout HEAD -- "${HAND_TUNED[@]}"
+echo "Restored the hand-tuned client files. The generator's changes to them are in $REGEN_DIFF;"
+echo "port any schema changes (new or renamed fields) from it by hand."
@@ -8,7 +8,7 @@ from typing import List, Any, Optional, Dict
 
 import httpx
 
-from ..exceptions import APIError, ConnectionError, NotFoundError
+from ..exceptions import APIError, ConnectionError, NotFoundError, OpenWebUIError
 from ..utils.kbignore_parser import KBIgnoreParser  # Assuming this is the correct path after copying
 from ..utils.api_utils import handle_api_response  # NEW IMPORT for centralized handler
 
@@ -46,6 +46,11 @@ from ..open_web_ui_client.open_web_ui_client.api.retrieval.query_collection_hand
 
 log = logging.getLogger(__name__)
 
+# Upper bound on in-flight DELETE requests during bulk deletion (typical server stream limit).
+MAX_CONCURRENT_DELETES = 100
+# Upper bound on in-flight upload + KB registration chains during directory uploads.
+MAX_CONCURRENT_UPLOADS = 10
+
 
 class KnowledgeBaseAPI:
     """
@@ -328,7 +333,11 @@ class KnowledgeBaseAPI:
             raise ConnectionError(f"A network error occurred during file upload: {e}") from e
 
     async def upload_directory(
-        self, directory_path: Path, kb_id: str, kbignore_file_path: Optional[Path] = None
+        self,
+        directory_path: Path,
+        kb_id: str,
+        kbignore_file_path: Optional[Path] = None,
+        max_concurrency: int = MAX_CONCURRENT_UPLOADS,
     ) -> List[models.FileModelResponse]:
         """
         Uploads all files from a directory to a knowledge base, respecting .kbignore rules.
@@ -338,16 +347,22 @@ class KnowledgeBaseAPI:
             kb_id: The ID of the knowledge base to upload files to.
             kbignore_file_path: Optional path to a custom .kbignore file. If None,
                                  it looks for .kbignore in the directory_path.
+            max_concurrency: The maximum number of files uploaded and registered at once.
+
+        Each file is uploaded and then linked to the knowledge base on its own. A file whose
+        upload or link fails (including connection and authentication errors) is logged and
+        left out of the result rather than aborting the rest of the directory.
 
         Returns:
             A list of FileModelResponse objects for successfully uploaded files.
 
         Raises:
+            ValueError: If max_concurrency is less than 1.
             NotADirectoryError: If directory_path is not a valid directory.
-            ConnectionError: If a network-related issue occurs.
-            AuthenticationError: If authentication fails.
-            APIError: For other API-related errors.
+            APIError: If every file in the directory failed to upload or link.
         """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}.")
         if not directory_path.is_dir():
             log.error(f"Directory not found: {directory_path}")
             raise NotADirectoryError(f"Directory not found: {directory_path}")
@@ -394,18 +409,22 @@ class KnowledgeBaseAPI:
         log.info(f"Identified {len(files_to_upload)} files for upload from '{directory_path}'.")
 
         uploaded_files: List[models.FileModelResponse] = []
-        uploaded_file_ids: List[str] = []
         failed_uploads_count = 0
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _upload_and_register(file_path: Path) -> models.FileModelResponse:
+            # Each file's registration awaits only its own upload, not the whole batch.
+            async with semaphore:
+                return await self._upload_and_register_file(file_path, kb_id)
 
         with tqdm.tqdm(
             total=len(files_to_upload), desc="Overall Upload Progress", unit="file", ncols=100
         ) as pbar:
-            tasks = [self._upload_single_file_for_batch(file_path) for file_path in files_to_upload]
+            tasks = [_upload_and_register(file_path) for file_path in files_to_upload]
             for future in asyncio.as_completed(tasks):
                 try:
                     uploaded_file = await future
                     uploaded_files.append(uploaded_file)
-                    uploaded_file_ids.append(uploaded_file.id)
                     log.debug(f"Successfully uploaded: '{uploaded_file.filename}' (ID: {uploaded_file.id})")
                 except Exception as e:
                     failed_uploads_count += 1
@@ -423,24 +442,45 @@ class KnowledgeBaseAPI:
                 )
             return []
 
-        log.info(f"Successfully uploaded {len(uploaded_files)} files. Linking to KB '{kb_id}'.")
+        log.info(f"Successfully uploaded and linked {len(uploaded_files)} files to KB '{kb_id}'.")
+        return uploaded_files
 
+    async def _upload_and_register_file(self, file_path: Path, kb_id: str) -> models.FileModelResponse:
+        """
+        Helper method that uploads a single file and immediately associates it with a KB,
+        used internally for batch uploads.
+
+        If linking fails, the uploaded file is deleted again so it is not left orphaned on
+        the server, and the linking error is re-raised (API errors keep their status code).
+        """
+        uploaded_file = await self._upload_single_file_for_batch(file_path)
         try:
-            batch_add_payload = [models.KnowledgeFileIdForm(file_id=file_id) for file_id in uploaded_file_ids]
             batch_response = await add_files_to_knowledge_batch_api_call(
-                id=kb_id, body=batch_add_payload, client=self._client
+                id=kb_id, body=[models.KnowledgeFileIdForm(file_id=uploaded_file.id)], client=self._client
             )
-            handle_api_response(batch_response, f"{len(uploaded_file_ids)} files batch association with KB")
-            log.info(f"Successfully linked {len(uploaded_file_ids)} files to KB '{kb_id}'.")
-        except httpx.ConnectError as e:
-            raise ConnectionError(f"A network error occurred while linking files to KB: {e}") from e
+            handle_api_response(batch_response, f"file association with KB for '{file_path.name}'")
         except Exception as e:
-            log.error(f"Failed to link all successfully uploaded files to KB '{kb_id}': {e}")
-            raise APIError(
-                f"Failed to link uploaded files to KB '{kb_id}': {e}", 0
-            )  # Use 0 or appropriate unknown code
-
-        return uploaded_files
+            log.error(f"Failed to link uploaded file '{file_path.name}' to KB '{kb_id}': {e}")
+            await self._delete_orphaned_file(uploaded_file.id, file_path)
+            if isinstance(e, httpx.ConnectError):
+                raise ConnectionError(
+                    f"A network error occurred while linking '{file_path.name}' to KB: {e}"
+                ) from e
+            if isinstance(e, OpenWebUIError):
+                raise
+            raise APIError(f"Failed to link uploaded file '{file_path.name}' to KB '{kb_id}': {e}", 0) from e
+        return uploaded_file
+
+    async def _delete_orphaned_file(self, file_id: str, file_path: Path) -> None:
+        """
+        Best-effort removal of a file that was uploaded but could not be linked to its KB.
+        Failures are logged rather than raised, so they do not mask the linking error.
+        """
+        try:
+            await self.delete_file(file_id)
+            log.info(f"Deleted unlinked upload of '{file_path.name}' (ID: {file_id}).")
+        except Exception as e:
+            log.warning(f"Could not delete unlinked upload of '{file_path.name}' (ID: {file_id}): {e}")
 
     async def _upload_single_file_for_batch(self, file_path: Path) -> models.FileModelResponse:
         """
@@ -503,7 +543,7 @@ class KnowledgeBaseAPI:
     async def delete_all_files_from_kb(self, kb_id: str) -> Dict[str, Any]:
         """
         Deletes all files associated with a specific knowledge base ID.
-        This operation lists all files in the KB and then deletes them individually.
+        This operation lists all files in the KB and then deletes them via `delete_files_bulk`.
 
         Args:
             kb_id: The ID of the knowledge base from which to delete all files.
@@ -518,26 +558,70 @@ class KnowledgeBaseAPI:
             APIError: For other API-related errors.
         """
         log.info(f"Initiating deletion of all files from Knowledge Base ID: '{kb_id}'.")
+        return await self.delete_files_bulk(kb_id)
+
+    async def delete_files_bulk(self, kb_id: str, file_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Deletes many files from a knowledge base in a single concurrent batch.
+
+        The API exposes no bulk-delete endpoint, so the individual DELETE requests are
+        issued concurrently over the shared client connection pool, bounded by
+        MAX_CONCURRENT_DELETES so the server is not flooded with streams.
+
+        Deleting a file removes it from the server entirely, so explicit `file_ids` are first
+        checked against the knowledge base's file list; IDs that do not belong to `kb_id`
+        are not deleted and are counted as failed.
+
+        Args:
+            kb_id: The ID of the knowledge base the files belong to.
+            file_ids: The IDs of the files to delete. If None, every file currently
+                      in the knowledge base is deleted.
+
+        Returns:
+            A dictionary containing counts of successful and failed deletions.
+
+        Raises:
+            ConnectionError: If a network-related issue occurs.
+            AuthenticationError: If authentication fails.
+            NotFoundError: If the knowledge base is not found.
+            APIError: For other API-related errors.
+        """
         try:
-            files_to_delete = await self.list_files(kb_id=kb_id)
+            kb_file_ids = [file.id for file in await self.list_files(kb_id=kb_id)]
         except NotFoundError:  # Catch case where KB doesn't exist
             raise NotFoundError(f"Knowledge Base with ID '{kb_id}' not found.")
         except Exception as e:  # Catch other errors during listing
             log.error(f"Failed to list files for KB '{kb_id}' prior to mass deletion: {e}")
             raise APIError(f"Failed to prepare file list for deletion in KB '{kb_id}': {e}", 0)
 
-        if not files_to_delete:
+        not_in_kb = 0
+        if file_ids is None:
+            file_ids = kb_file_ids
+        else:
+            kb_file_id_set = set(kb_file_ids)
+            foreign_ids = [file_id for file_id in file_ids if file_id not in kb_file_id_set]
+            if foreign_ids:
+                log.warning(
+                    f"Not deleting {len(foreign_ids)} files that are not in KB '{kb_id}': {foreign_ids}"
+                )
+                not_in_kb = len(foreign_ids)
+                file_ids = [file_id for file_id in file_ids if file_id in kb_file_id_set]
+
+        if not file_ids:
             log.info(f"No files found in Knowledge Base '{kb_id}'. Nothing to delete.")
-            return {"successful": 0, "failed": 0}
+            return {"successful": 0, "failed": not_in_kb}
 
-        log.info(f"Found {len(files_to_delete)} files to delete from KB '{kb_id}'.")
-        delete_tasks = [self.delete_file(file.id) for file in files_to_delete]
+        log.info(f"Found {len(file_ids)} files to delete from KB '{kb_id}'.")
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DELETES)
 
-        successful_deletes = 0
-        failed_deletes = 0
+        async def _bounded_delete(file_id: str) -> bool:
+            async with semaphore:
+                return await self.delete_file(file_id)
 
-        import tqdm  # Assuming tqdm is installed via dependencies
-        import asyncio  # Assuming asyncio is available
+        delete_tasks = [_bounded_delete(file_id) for file_id in file_ids]
+
+        successful_deletes = 0
+        failed_deletes = not_in_kb
 
         with tqdm.tqdm(total=len(delete_tasks), desc="Deleting Files", unit="file", ncols=100) as pbar:
             for future in asyncio.as_completed(delete_tasks):
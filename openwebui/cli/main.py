@@ -3,6 +3,7 @@ import asyncio
 import logging
 import json
 from pathlib import Path  # Added for path operations in upload_dir & update_file
+from types import GeneratorType
 from typing import Optional, Any, List
 
 import click
@@ -16,12 +17,19 @@ from openwebui.exceptions import OpenWebUIError, NotFoundError, AuthenticationEr
 log = logging.getLogger(__name__)
 log.setLevel(logging.WARNING)  # Default level for SDK unless flags are used
 
+# Formatters are built once and swapped on the shared handler per command. The plain one skips
+# the asctime (time.strftime) work on every record when only warnings/errors are shown.
+_VERBOSE_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+_PLAIN_FORMATTER = logging.Formatter("%(message)s")
+
 # Add the StreamHandler to stderr early and once
+_stderr_handler: logging.Handler
 if not log.handlers:
-    handler = logging.StreamHandler(sys.stderr)
-    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-    handler.setFormatter(formatter)
-    log.addHandler(handler)
+    _stderr_handler = logging.StreamHandler(sys.stderr)
+    _stderr_handler.setFormatter(_VERBOSE_FORMATTER)
+    log.addHandler(_stderr_handler)
+else:
+    _stderr_handler = log.handlers[0]
 
 
 # --- Output Formatting Helper ---
@@ -50,8 +58,21 @@ def format_output(data: Any, output_format: str):
                 return {k: to_json_compatible(v) for k, v in obj.__dict__.items()}
             return obj
 
+        if isinstance(data, GeneratorType):
+            # Stream-encode one item at a time so large result sets are never materialized
+            # as a full list. Output is identical to json.dumps(list(data), indent=2).
+            first = True
+            for item in data:
+                encoded = json.dumps(to_json_compatible(item), indent=2).replace("\n", "\n  ")
+                click.echo(f"[\n  {encoded}" if first else f",\n  {encoded}", nl=False)
+                first = False
+            click.echo("[]" if first else "\n]")
+            return
+
         click.echo(json.dumps(to_json_compatible(data), indent=2))
     else:  # Default to text output
+        if isinstance(data, GeneratorType):
+            data = list(data)  # Text output echoes the whole value; never print a generator's repr
         click.echo(data)
 
 
@@ -82,6 +103,7 @@ def cli(ctx, verbose: bool, debug: bool, output: str):
         log_level = logging.INFO
 
     log.setLevel(log_level)
+    _stderr_handler.setFormatter(_PLAIN_FORMATTER if log_level == logging.WARNING else _VERBOSE_FORMATTER)
     logging.basicConfig()
     # Store output format in context object for subcommands
     ctx.ensure_object(dict)
@@ -154,9 +176,9 @@ async def _create_chat_async(
     hybrid: Optional[bool],
     hybrid_bm25_weight: Optional[float],
 ):
-    log.info(f"CLI: Attempting to create chat with prompt: '{prompt[:50]}...'")
+    log.info("CLI: Attempting to create chat with prompt: '%.50s...'", prompt)
     if kb_ids:
-        log.info(f"CLI: Using knowledge bases: {kb_ids}")
+        log.info("CLI: Using knowledge bases: %s", kb_ids)
 
     try:
         sdk = OpenWebUI()
@@ -249,9 +271,9 @@ async def _continue_chat_async(
     hybrid: Optional[bool],
     hybrid_bm25_weight: Optional[float],
 ):
-    log.info(f"CLI: Attempting to continue chat '{chat_id}' with prompt: '{prompt}...'")
+    log.info("CLI: Attempting to continue chat '%s' with prompt: '%s...'", chat_id, prompt)
     if kb_ids:
-        log.info(f"CLI: Using knowledge bases: {kb_ids}")
+        log.info("CLI: Using knowledge bases: %s", kb_ids)
 
     try:
         sdk = OpenWebUI()
@@ -295,7 +317,7 @@ def list_messages_command_wrapper(ctx, chat_id: str):
 
 
 async def _list_messages_async(ctx, chat_id: str):
-    log.info(f"CLI: Attempting to list messages for chat ID: {chat_id}")
+    log.info("CLI: Attempting to list messages for chat ID: %s", chat_id)
     try:
         sdk = OpenWebUI()
         chat_details = await sdk.chats.get(chat_id)
@@ -332,7 +354,7 @@ def rename_chat_command_wrapper(ctx, chat_id: str, new_title: str):
 
 
 async def _rename_chat_async(ctx, chat_id: str, new_title: str):
-    log.info(f"CLI: Attempting to rename chat '{chat_id}' to '{new_title}'.")
+    log.info("CLI: Attempting to rename chat '%s' to '%s'.", chat_id, new_title)
     try:
         sdk = OpenWebUI()
         updated_chat = await sdk.chats.rename(chat_id=chat_id, new_title=new_title)
@@ -366,7 +388,7 @@ async def _delete_chat_async(ctx, chat_id: str):
         click.echo("Aborted.")
         raise click.Abort()
 
-    log.info(f"CLI: Attempting to delete chat ID: {chat_id}")
+    log.info("CLI: Attempting to delete chat ID: %s", chat_id)
     try:
         sdk = OpenWebUI()
         success = await sdk.chats.delete(chat_id=chat_id)
@@ -410,7 +432,7 @@ def create_folder_command_wrapper(ctx, name: str):
 
 
 async def _create_folder_async(ctx, name: str):
-    log.info(f"CLI: Attempting to create folder with name: '{name}'.")
+    log.info("CLI: Attempting to create folder with name: '%s'.", name)
     try:
         sdk = OpenWebUI()
         new_folder = await sdk.folders.create(name=name)
@@ -448,7 +470,7 @@ async def _list_all_folders_async(ctx):
         folders = await sdk.folders.list()
 
         if ctx.obj["OUTPUT_FORMAT"] == "json":
-            format_output(folders, ctx.obj["OUTPUT_FORMAT"])
+            format_output((folder for folder in folders), ctx.obj["OUTPUT_FORMAT"])
         else:
             if not folders:
                 click.echo("No folders found on the server.")
@@ -461,7 +483,7 @@ async def _list_all_folders_async(ctx):
                 folder_id = folder_item.id
                 folder_name = folder_item.name or "Unnamed Folder"
                 click.echo(f"  - ID: {folder_id}, Name: {folder_name}")
-            log.info(f"CLI: Folder listing command completed successfully. Found {len(folders)} folders.")
+            log.info("CLI: Folder listing command completed successfully. Found %d folders.", len(folders))
 
     except (AuthenticationError, APIError, httpx.RequestError, OpenWebUIError) as e:
         click.secho(f"An error occurred while listing folders: {e}", fg="red", err=True)
@@ -480,17 +502,17 @@ def list_chats_in_folder_command_wrapper(ctx, folder_id: str):
 
 
 async def _list_chats_in_folder_async(ctx, folder_id: str):
-    log.info(f"CLI: Attempting to list chats in folder ID: {folder_id}")
+    log.info("CLI: Attempting to list chats in folder ID: %s", folder_id)
     try:
         sdk = OpenWebUI()
         chats_in_folder = await sdk.chats.list_by_folder(folder_id=folder_id)
 
         if ctx.obj["OUTPUT_FORMAT"] == "json":
-            format_output(chats_in_folder, ctx.obj["OUTPUT_FORMAT"])
+            format_output((chat_item for chat_item in chats_in_folder), ctx.obj["OUTPUT_FORMAT"])
         else:
             if not chats_in_folder:
                 click.echo(f"No chats found in folder '{folder_id}'.")
-                log.info(f"CLI: No chats found in folder '{folder_id}'.")
+                log.info("CLI: No chats found in folder '%s'.", folder_id)
                 return
 
             click.secho(f"Chats in folder '{folder_id}':", bold=True)
@@ -524,7 +546,7 @@ async def _delete_folder_async(ctx, folder_id: str):
         click.echo("Aborted.")
         raise click.Abort()
 
-    log.info(f"CLI: Attempting to delete folder ID: {folder_id}")
+    log.info("CLI: Attempting to delete folder ID: %s", folder_id)
     try:
         sdk = OpenWebUI()
         success = await sdk.folders.delete(folder_id=folder_id)
@@ -570,7 +592,7 @@ def create_kb_command_wrapper(ctx, name: str, description: Optional[str]):
 
 
 async def _create_kb_async(ctx, name: str, description: Optional[str]):
-    log.info(f"CLI: Creating Knowledge Base: {name}")
+    log.info("CLI: Creating Knowledge Base: %s", name)
     try:
         sdk = OpenWebUI()
         # Assuming sdk.knowledge.create returns a model with .id, .name, .description
@@ -616,15 +638,15 @@ async def _list_kbs_async(ctx):
         kbs = await sdk.knowledge.list_all()
 
         if ctx.obj["OUTPUT_FORMAT"] == "json":
-            kbs_list_dicts = []
-            for kb_found in kbs:
-                kb_data = {
+            kbs_dicts = (
+                {
                     "id": kb_found.id,
                     "name": kb_found.name,
                     "description": getattr(kb_found, "description", None),
                 }
-                kbs_list_dicts.append(kb_data)
-            format_output(kbs_list_dicts, ctx.obj["OUTPUT_FORMAT"])
+                for kb_found in kbs
+            )
+            format_output(kbs_dicts, ctx.obj["OUTPUT_FORMAT"])
         else:
             if not kbs:
                 click.echo("No knowledge bases found on the server.")
@@ -657,27 +679,29 @@ def list_kb_files_command_wrapper(ctx, kb_id: str):
     asyncio.run(_list_kb_files_async(ctx, kb_id))
 
 
+def _kb_file_dict(f) -> dict:
+    """Builds the JSON output entry for one file of a knowledge base."""
+    # Accessing additional_properties safely. Assumes it's a dict.
+    additional_meta = getattr(getattr(f, "meta", None), "additional_properties", {})
+    return {
+        "id": f.id,
+        "filename": additional_meta.get("name", "[Filename Missing]"),
+        "filepath": additional_meta.get("collection_name", "[Filepath Missing]"),
+        "mime_type": additional_meta.get("content_type", "[MIME Type Missing]"),
+        "size": additional_meta.get("size", 0),  # Default size to 0
+        "meta_raw": additional_meta,
+    }
+
+
 async def _list_kb_files_async(ctx, kb_id: str):
-    log.info(f"CLI: Listing files for KB '{kb_id}'...")
+    log.info("CLI: Listing files for KB '%s'...", kb_id)
     try:
         sdk = OpenWebUI()
         # Assuming sdk.knowledge.list_files returns a list of models.FileMetadataResponse
         files = await sdk.knowledge.list_files(kb_id)
 
         if ctx.obj["OUTPUT_FORMAT"] == "json":
-            files_list_dicts = []
-            for f in files:
-                # Accessing additional_properties safely. Assumes it's a dict.
-                additional_meta = getattr(getattr(f, "meta", None), "additional_properties", {})
-                file_dict = {
-                    "id": f.id,
-                    "filename": additional_meta.get("name", "[Filename Missing]"),
-                    "filepath": additional_meta.get("collection_name", "[Filepath Missing]"),
-                    "mime_type": additional_meta.get("content_type", "[MIME Type Missing]"),
-                    "size": additional_meta.get("size", 0),  # Default size to 0
-                    "meta_raw": additional_meta,
-                }
-                files_list_dicts.append(file_dict)
+            files_list_dicts = (_kb_file_dict(f) for f in files)
             format_output(files_list_dicts, ctx.obj["OUTPUT_FORMAT"])
         else:
             if not files:
@@ -718,7 +742,7 @@ def upload_file_command_wrapper(ctx, file_path: str, kb_id: str):
 
 async def _upload_file_async(ctx, file_path_str: str, kb_id: str):
     file_path = Path(file_path_str)
-    log.info(f"CLI: Uploading file: {file_path.name} to KB '{kb_id}'")
+    log.info("CLI: Uploading file: %s to KB '%s'", file_path.name, kb_id)
     try:
         sdk = OpenWebUI()
         # Assuming sdk.knowledge.upload_file returns FileModelResponse
@@ -770,16 +794,15 @@ async def _upload_dir_async(ctx, directory_path_str: str, kb_id: str, ignore_fil
     directory_path = Path(directory_path_str)
     ignore_file_path = Path(ignore_file_str) if ignore_file_str else None
 
-    # Path to os.path for walk logic. This imports should be at the top of file
-    log.info(f"CLI: Uploading directory: {directory_path.name} to KB '{kb_id}'")
+    log.info("CLI: Uploading directory: %s to KB '%s'", directory_path.name, kb_id)
     try:
         sdk = OpenWebUI()
         # Assuming sdk.knowledge.upload_directory returns List[FileModelResponse]
         uploaded_files = await sdk.knowledge.upload_directory(directory_path, kb_id, ignore_file_path)
 
         if ctx.obj["OUTPUT_FORMAT"] == "json":
-            files_list_dicts = [{"id": f.id, "filename": f.filename} for f in uploaded_files]
-            format_output(files_list_dicts, ctx.obj["OUTPUT_FORMAT"])
+            files_dicts = ({"id": f.id, "filename": f.filename} for f in uploaded_files)
+            format_output(files_dicts, ctx.obj["OUTPUT_FORMAT"])
         else:
             click.secho(
                 f"✅ Successfully uploaded {len(uploaded_files)} files from '{directory_path.name}' to KB '{kb_id}'.",
@@ -814,7 +837,7 @@ def update_file_command_wrapper(ctx, file_id: str, new_file_path: str):
 
 async def _update_file_async(ctx, file_id: str, new_file_path_str: str):
     new_file_path = Path(new_file_path_str)
-    log.info(f"CLI: Updating file ID: {file_id} with content from {new_file_path.name}")
+    log.info("CLI: Updating file ID: %s with content from %s", file_id, new_file_path.name)
     try:
         sdk = OpenWebUI()
         # Assuming sdk.knowledge.update_file returns FileModelResponse
@@ -862,7 +885,7 @@ async def _delete_file_async(ctx, file_id: str):
         click.echo("Aborted.")
         raise click.Abort()
 
-    log.info(f"CLI: Deleting file ID: {file_id}")
+    log.info("CLI: Deleting file ID: %s", file_id)
     try:
         sdk = OpenWebUI()
         success = await sdk.knowledge.delete_file(file_id)
@@ -901,7 +924,7 @@ def delete_all_files_command_wrapper(ctx, kb_id: str, yes: bool):
 
 
 async def _delete_all_files_async(ctx, kb_id: str, yes: bool):
-    log.info(f"CLI: Attempting to delete all files from Knowledge Base ID: {kb_id}")
+    log.info("CLI: Attempting to delete all files from Knowledge Base ID: %s", kb_id)
 
     if ctx.obj["OUTPUT_FORMAT"] == "text" and not yes:
         click.secho(
@@ -1,5 +1,8 @@
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
+
+import httpx
+
 from .config import get_config, Config
 from .exceptions import OpenWebUIError
 from .api.folders import FoldersAPI
@@ -11,6 +14,10 @@ from .open_web_ui_client.open_web_ui_client import AuthenticatedClient
 
 log = logging.getLogger(__name__)
 
+# Connection pool settings for the shared httpx.AsyncClient. Idle connections are kept for
+# 30s (httpx defaults to 5s) so bursts of calls separated by short pauses reuse TCP/TLS sessions.
+DEFAULT_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+
 
 class OpenWebUI:
     """
@@ -29,8 +36,16 @@ class OpenWebUI:
         base_url: Optional[str] = None,
         api_key: Optional[str] = None,
         timeout: int = 30,
+        httpx_args: Optional[Dict[str, Any]] = None,
     ):
-        """Initializes the OpenWebUI client."""
+        """
+        Initializes the OpenWebUI client.
+
+        `httpx_args` is passed through to the underlying `httpx.AsyncClient` (e.g. a custom
+        `transport` for proxies or recorded responses). That single client is created on first
+        use and shared by every API group, so all requests reuse one connection pool; its
+        `limits` default to `DEFAULT_HTTP_LIMITS`.
+        """
         log.debug("Initializing OpenWebUI client.")
         if config is None:
             try:
@@ -54,6 +69,7 @@ class OpenWebUI:
             base_url=base_url,
             token=api_key,
             timeout=timeout,
+            httpx_args={"limits": DEFAULT_HTTP_LIMITS, **(httpx_args or {})},
         )
 
         self.folders = FoldersAPI(self._client)
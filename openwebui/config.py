@@ -1,15 +1,35 @@
 import os
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from dataclasses import dataclass
+from urllib.parse import urlsplit
 
-# Import PyYAML
+# Import PyYAML, preferring the libyaml-backed C loader when it is available
 import yaml
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
 from dotenv import load_dotenv  # Still used for loading env vars for highest precedence
 
 # Paths for configuration files
 DEFAULT_USER_CONFIG_PATH = os.path.expanduser("~/.owui/config.yaml")
 LOCAL_PROJECT_CONFIG_PATH = ".owui/config.yaml"
 
+# Environment variables for the server URL and API key, in that order
+_ENV_KEYS = ("OPENWEBUI_URL", "OPENWEBUI_API_KEY")
+
+# Validation error messages
+_ERR_NO_URL = (
+    "Configuration error: Open WebUI server URL is not configured. "
+    "Please set OPENWEBUI_URL environment variable or 'server.url' in ~/.owui/config.yaml or ./.owui/config.yaml."
+)
+_ERR_NO_KEY = (
+    "Configuration error: Open WebUI API key is not configured. "
+    "Please set OPENWEBUI_API_KEY environment variable or 'server.api_key' in ~/.owui/config.yaml or ./.owui/config.yaml."
+)
+_ERR_BAD_URL = "Configuration error: Open WebUI server URL '{}' must be an absolute http:// or https:// URL."
+
 # Load environment variables first (they have highest precedence)
 load_dotenv()
 
@@ -27,12 +47,43 @@ class Config:
     api_key: str
 
 
+def _try_load(path: str) -> Dict[str, Any]:
+    """
+    Loads a single YAML config file, treating a missing file as empty config.
+
+    The file is opened directly rather than checked with os.path.exists first, which
+    saves a stat() call and avoids a race between the check and the open.
+
+    Args:
+        path: The path of the YAML file to load.
+
+    Returns:
+        Dict[str, Any]: The parsed mapping, or an empty dict if the file is missing
+        or its root is not a mapping.
+
+    Raises:
+        ValueError: If the file exists but cannot be read or parsed.
+    """
+    try:
+        with open(path, "rb") as f:
+            loaded_yaml = yaml.load(f, Loader=_SafeLoader)
+    except FileNotFoundError:
+        return {}
+    except yaml.YAMLError as e:
+        raise ValueError(f"Error parsing YAML config file '{path}': {e}")
+    except OSError as e:
+        raise ValueError(f"Error reading YAML config file '{path}': {e}")
+
+    return loaded_yaml if isinstance(loaded_yaml, dict) else {}  # Ensure root is a dict
+
+
 def _load_yaml_config() -> Dict[str, Any]:
     """
     Attempts to load configuration from YAML files in predefined locations.
 
-    Loads from DEFAULT_USER_CONFIG_PATH first, then LOCAL_PROJECT_CONFIG_PATH,
-    allowing the local project config to override user-level config.
+    Files are loaded in order of precedence:
+    DEFAULT_USER_CONFIG_PATH first, then LOCAL_PROJECT_CONFIG_PATH, allowing the
+    local project config to override user-level config.
 
     Returns:
         Dict[str, Any]: A dictionary containing loaded YAML configuration.
@@ -40,36 +91,63 @@ def _load_yaml_config() -> Dict[str, Any]:
     Raises:
         ValueError: If a YAML file is found but cannot be parsed.
     """
-    config_data = {}
-
-    # Load from user's home directory
-    if os.path.exists(DEFAULT_USER_CONFIG_PATH):
-        try:
-            with open(DEFAULT_USER_CONFIG_PATH, "r") as f:
-                loaded_yaml = yaml.safe_load(f)
-                if isinstance(loaded_yaml, dict):  # Ensure root is a dict
-                    config_data.update(loaded_yaml)
-        except yaml.YAMLError as e:
-            raise ValueError(f"Error parsing YAML config file '{DEFAULT_USER_CONFIG_PATH}': {e}")
-        except OSError as e:
-            raise ValueError(f"Error reading YAML config file '{DEFAULT_USER_CONFIG_PATH}': {e}")
-
+    config_data = _try_load(DEFAULT_USER_CONFIG_PATH)
     # Load from local project directory (overrides user config)
-    if os.path.exists(LOCAL_PROJECT_CONFIG_PATH):
-        try:
-            with open(LOCAL_PROJECT_CONFIG_PATH, "r") as f:
-                loaded_yaml = yaml.safe_load(f)
-                if isinstance(loaded_yaml, dict):  # Ensure root is a dict
-                    config_data.update(loaded_yaml)
-        except yaml.YAMLError as e:
-            raise ValueError(f"Error parsing YAML config file '{LOCAL_PROJECT_CONFIG_PATH}': {e}")
-        except OSError as e:
-            raise ValueError(f"Error reading YAML config file '{LOCAL_PROJECT_CONFIG_PATH}': {e}")
-
+    config_data.update(_try_load(LOCAL_PROJECT_CONFIG_PATH))
     return config_data
 
 
+def _mtime(path: str) -> Optional[float]:
+    """Returns the modification time of `path`, or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+# Cache of the last resolved Config, keyed on every input that can change it.
+_cached_config: Optional[Tuple[Tuple[Any, ...], Config]] = None
+
+
 def get_config() -> Config:
+    """
+    Returns the effective configuration, memoized across calls.
+
+    Environment variables are read first; when both are set the YAML files are never
+    touched. Otherwise the result of `_resolve_config()` is cached and only recomputed
+    when one of the environment variables or the modification time of either config
+    file changes, so repeated SDK instantiations do not re-read and re-parse the YAML files.
+
+    Returns:
+        Config: A validated configuration object.
+
+    Raises:
+        ValueError: If server URL or API key is not found in any source.
+    """
+    global _cached_config
+
+    environ = os.environ
+    server_url: Optional[str] = environ.get(_ENV_KEYS[0])
+    api_key: Optional[str] = environ.get(_ENV_KEYS[1])
+    if server_url and api_key:
+        return _resolve_config(server_url, api_key)
+
+    cache_key = (
+        server_url,
+        api_key,
+        _mtime(DEFAULT_USER_CONFIG_PATH),
+        os.path.abspath(LOCAL_PROJECT_CONFIG_PATH),
+        _mtime(LOCAL_PROJECT_CONFIG_PATH),
+    )
+    if _cached_config is not None and _cached_config[0] == cache_key:
+        return _cached_config[1]
+
+    config = _resolve_config(server_url, api_key)
+    _cached_config = (cache_key, config)
+    return config
+
+
+def _resolve_config(server_url: Optional[str], api_key: Optional[str]) -> Config:
     """
     Loads and validates configuration from multiple sources with defined precedence.
 
@@ -78,37 +156,36 @@ def get_config() -> Config:
     2. Local project config file (`.owui/config.yaml`)
     3. User-level config file (`~/.owui/config.yaml`)
 
+    Args:
+        server_url: The server URL from the environment, if set.
+        api_key: The API key from the environment, if set.
+
     Returns:
         Config: A validated configuration object.
 
     Raises:
-        ValueError: If server URL or API key is not found in any source.
+        ValueError: If server URL or API key is not found in any source, or the
+            server URL is not an absolute http(s) URL.
     """
-    # 1. Load from YAML files
-    yaml_config = _load_yaml_config()
-
-    # 2. Get values from environment variables (highest precedence)
-    server_url: Optional[str] = os.getenv("OPENWEBUI_URL")
-    api_key: Optional[str] = os.getenv("OPENWEBUI_API_KEY")
-
-    # 3. If not found in env, try YAML config
-    if not server_url:
-        server_url = yaml_config.get("server", {}).get("url")
-    if not api_key:
-        api_key = yaml_config.get("server", {}).get("api_key")
+    # Environment variables have the highest precedence, so the YAML files are only
+    # loaded when one of them is missing.
+    if not server_url or not api_key:
+        yaml_config = _load_yaml_config()
+        if not server_url:
+            server_url = yaml_config.get("server", {}).get("url")
+        if not api_key:
+            api_key = yaml_config.get("server", {}).get("api_key")
 
     # Basic validation
     if not server_url:
-        raise ValueError(
-            "Configuration error: Open WebUI server URL is not configured. "
-            "Please set OPENWEBUI_URL environment variable or 'server.url' in ~/.owui/config.yaml or ./.owui/config.yaml."
-        )
-
+        raise ValueError(_ERR_NO_URL)
     if not api_key:
-        raise ValueError(
-            "Configuration error: Open WebUI API key is not configured. "
-            "Please set OPENWEBUI_API_KEY environment variable or 'server.api_key' in ~/.owui/config.yaml or ./.owui/config.yaml."
-        )
+        raise ValueError(_ERR_NO_KEY)
+
+    # Validate the URL once here so the HTTP client can trust it on every request
+    parts = urlsplit(server_url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        raise ValueError(_ERR_BAD_URL.format(server_url))
 
     # Ensure the URL doesn't have a trailing slash for consistency
     return Config(server_url=server_url.rstrip("/"), api_key=api_key)
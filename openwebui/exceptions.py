@@ -1,3 +1,7 @@
+from functools import cached_property
+from typing import Optional
+
+
 class OpenWebUIError(Exception):
     """
     Base exception class for all errors raised by the OpenWebUI SDK.
@@ -16,12 +20,29 @@ class APIError(OpenWebUIError):
     Attributes:
         status_code (int): The HTTP status code of the error response.
         message (str): The error message from the API response body.
+        raw (Optional[bytes]): The undecoded response body, if attached. It is only
+            decoded when the error is displayed, so large error pages cost nothing
+            for callers that only inspect `status_code`.
     """
 
-    def __init__(self, message: str, status_code: int):
+    def __init__(self, message: str, status_code: int, raw: Optional[bytes] = None):
         self.status_code = status_code
+        self.raw = raw
         super().__init__(f"API Error {status_code}: {message}")
 
+    @cached_property
+    def body(self) -> Optional[str]:
+        """The attached response body decoded as UTF-8, or None if there is none."""
+        if self.raw is None:
+            return None
+        return self.raw.decode("utf-8", errors="ignore")
+
+    def __str__(self) -> str:
+        text = super().__str__()
+        if self.raw is None:
+            return text
+        return f"{text}: {self.body}"
+
 
 class AuthenticationError(APIError):
     """
@@ -1,19 +1,43 @@
+# Hand-tuned generated file: generate_client.sh restores it after regenerating (see HAND_TUNED there).
 import datetime
 from collections.abc import Mapping
-from typing import TYPE_CHECKING, Any, TypeVar, Union, cast
+from typing import Any, TypeVar, Union
 
 from attrs import define as _attrs_define
 from attrs import field as _attrs_field
-from dateutil.parser import isoparse
-
-from ..types import UNSET, Unset
-
-if TYPE_CHECKING:
-    from ..models.session_user_info_response_permissions_type_0 import SessionUserInfoResponsePermissionsType0
 
+from ..models.session_user_info_response_permissions_type_0 import SessionUserInfoResponsePermissionsType0
+from ..types import UNSET, Unset, json_dumps_bytes, parse_iso_date
 
 T = TypeVar("T", bound="SessionUserInfoResponse")
 
+# Keys consumed by from_dict; anything else is kept in additional_properties.
+_KNOWN = frozenset(
+    {
+        "id",
+        "email",
+        "name",
+        "role",
+        "profile_image_url",
+        "token",
+        "token_type",
+        "expires_at",
+        "permissions",
+        "bio",
+        "gender",
+        "date_of_birth",
+    }
+)
+
+
+def _parse_permissions(data: Any) -> Union["SessionUserInfoResponsePermissionsType0", None, Unset]:
+    if isinstance(data, dict):
+        try:
+            return SessionUserInfoResponsePermissionsType0.from_dict(data)
+        except (KeyError, ValueError, TypeError):
+            pass
+    return data
+
 
 @_attrs_define
 class SessionUserInfoResponse:
@@ -48,161 +72,65 @@ class SessionUserInfoResponse:
     additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
-        from ..models.session_user_info_response_permissions_type_0 import SessionUserInfoResponsePermissionsType0
-
-        id = self.id
-
-        email = self.email
-
-        name = self.name
-
-        role = self.role
-
-        profile_image_url = self.profile_image_url
-
-        token = self.token
-
-        token_type = self.token_type
-
-        expires_at: Union[None, Unset, int]
-        if isinstance(self.expires_at, Unset):
-            expires_at = UNSET
-        else:
-            expires_at = self.expires_at
-
-        permissions: Union[None, Unset, dict[str, Any]]
-        if isinstance(self.permissions, Unset):
-            permissions = UNSET
-        elif isinstance(self.permissions, SessionUserInfoResponsePermissionsType0):
-            permissions = self.permissions.to_dict()
-        else:
+        field_dict: dict[str, Any] = {
+            **self.additional_properties,
+            "id": self.id,
+            "email": self.email,
+            "name": self.name,
+            "role": self.role,
+            "profile_image_url": self.profile_image_url,
+            "token": self.token,
+            "token_type": self.token_type,
+        }
+        if self.expires_at is not UNSET:
+            field_dict["expires_at"] = self.expires_at
+        if self.permissions is not UNSET:
             permissions = self.permissions
-
-        bio: Union[None, Unset, str]
-        if isinstance(self.bio, Unset):
-            bio = UNSET
-        else:
-            bio = self.bio
-
-        gender: Union[None, Unset, str]
-        if isinstance(self.gender, Unset):
-            gender = UNSET
-        else:
-            gender = self.gender
-
-        date_of_birth: Union[None, Unset, str]
-        if isinstance(self.date_of_birth, Unset):
-            date_of_birth = UNSET
-        elif isinstance(self.date_of_birth, datetime.date):
-            date_of_birth = self.date_of_birth.isoformat()
-        else:
+            field_dict["permissions"] = (
+                permissions.to_dict()
+                if isinstance(permissions, SessionUserInfoResponsePermissionsType0)
+                else permissions
+            )
+        if self.bio is not UNSET:
+            field_dict["bio"] = self.bio
+        if self.gender is not UNSET:
+            field_dict["gender"] = self.gender
+        if self.date_of_birth is not UNSET:
             date_of_birth = self.date_of_birth
-
-        field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
-        field_dict.update(
-            {
-                "id": id,
-                "email": email,
-                "name": name,
-                "role": role,
-                "profile_image_url": profile_image_url,
-                "token": token,
-                "token_type": token_type,
-            }
-        )
-        if expires_at is not UNSET:
-            field_dict["expires_at"] = expires_at
-        if permissions is not UNSET:
-            field_dict["permissions"] = permissions
-        if bio is not UNSET:
-            field_dict["bio"] = bio
-        if gender is not UNSET:
-            field_dict["gender"] = gender
-        if date_of_birth is not UNSET:
-            field_dict["date_of_birth"] = date_of_birth
+            field_dict["date_of_birth"] = (
+                date_of_birth.isoformat() if isinstance(date_of_birth, datetime.date) else date_of_birth
+            )
 
         return field_dict
 
+    def to_json_bytes(self) -> bytes:
+        return json_dumps_bytes(self.to_dict())
+
     @classmethod
     def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
-        from ..models.session_user_info_response_permissions_type_0 import SessionUserInfoResponsePermissionsType0
-
-        d = dict(src_dict)
-        id = d.pop("id")
-
-        email = d.pop("email")
-
-        name = d.pop("name")
-
-        role = d.pop("role")
-
-        profile_image_url = d.pop("profile_image_url")
-
-        token = d.pop("token")
-
-        token_type = d.pop("token_type")
-
-        def _parse_expires_at(data: object) -> Union[None, Unset, int]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            return cast(Union[None, Unset, int], data)
+        id = src_dict["id"]
 
-        expires_at = _parse_expires_at(d.pop("expires_at", UNSET))
+        email = src_dict["email"]
 
-        def _parse_permissions(data: object) -> Union["SessionUserInfoResponsePermissionsType0", None, Unset]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            try:
-                if not isinstance(data, dict):
-                    raise TypeError()
-                permissions_type_0 = SessionUserInfoResponsePermissionsType0.from_dict(data)
+        name = src_dict["name"]
 
-                return permissions_type_0
-            except:  # noqa: E722
-                pass
-            return cast(Union["SessionUserInfoResponsePermissionsType0", None, Unset], data)
+        role = src_dict["role"]
 
-        permissions = _parse_permissions(d.pop("permissions", UNSET))
+        profile_image_url = src_dict["profile_image_url"]
 
-        def _parse_bio(data: object) -> Union[None, Unset, str]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            return cast(Union[None, Unset, str], data)
+        token = src_dict["token"]
 
-        bio = _parse_bio(d.pop("bio", UNSET))
+        token_type = src_dict["token_type"]
 
-        def _parse_gender(data: object) -> Union[None, Unset, str]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            return cast(Union[None, Unset, str], data)
+        expires_at = src_dict.get("expires_at", UNSET)
 
-        gender = _parse_gender(d.pop("gender", UNSET))
+        permissions = _parse_permissions(src_dict.get("permissions", UNSET))
 
-        def _parse_date_of_birth(data: object) -> Union[None, Unset, datetime.date]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            try:
-                if not isinstance(data, str):
-                    raise TypeError()
-                date_of_birth_type_0 = isoparse(data).date()
+        bio = src_dict.get("bio", UNSET)
 
-                return date_of_birth_type_0
-            except:  # noqa: E722
-                pass
-            return cast(Union[None, Unset, datetime.date], data)
+        gender = src_dict.get("gender", UNSET)
 
-        date_of_birth = _parse_date_of_birth(d.pop("date_of_birth", UNSET))
+        date_of_birth = parse_iso_date(src_dict.get("date_of_birth", UNSET))
 
         session_user_info_response = cls(
             id=id,
@@ -219,7 +147,7 @@ class SessionUserInfoResponse:
             date_of_birth=date_of_birth,
         )
 
-        session_user_info_response.additional_properties = d
+        session_user_info_response.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN}
         return session_user_info_response
 
     @property
@@ -1,17 +1,18 @@
+# Hand-tuned generated file: generate_client.sh restores it after regenerating (see HAND_TUNED there).
 from collections.abc import Mapping
-from typing import TYPE_CHECKING, Any, TypeVar, Union
+from typing import Any, TypeVar, Union
 
 from attrs import define as _attrs_define
 from attrs import field as _attrs_field
 
-from ..types import UNSET, Unset
-
-if TYPE_CHECKING:
-    from ..models.model_model import ModelModel
-
+from ..models.model_model import ModelModel
+from ..types import UNSET, Unset, json_dumps_bytes
 
 T = TypeVar("T", bound="SyncModelsForm")
 
+# Keys consumed by from_dict; anything else is kept in additional_properties.
+_KNOWN = frozenset({"models"})
+
 
 @_attrs_define
 class SyncModelsForm:
@@ -24,38 +25,25 @@ class SyncModelsForm:
     additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
-        models: Union[Unset, list[dict[str, Any]]] = UNSET
-        if not isinstance(self.models, Unset):
-            models = []
-            for models_item_data in self.models:
-                models_item = models_item_data.to_dict()
-                models.append(models_item)
-
-        field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
-        field_dict.update({})
-        if models is not UNSET:
-            field_dict["models"] = models
+        field_dict: dict[str, Any] = {**self.additional_properties}
+        if isinstance(self.models, list):
+            field_dict["models"] = [models_item_data.to_dict() for models_item_data in self.models]
 
         return field_dict
 
+    def to_json_bytes(self) -> bytes:
+        return json_dumps_bytes(self.to_dict())
+
     @classmethod
     def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
-        from ..models.model_model import ModelModel
-
-        d = dict(src_dict)
-        models = []
-        _models = d.pop("models", UNSET)
-        for models_item_data in _models or []:
-            models_item = ModelModel.from_dict(models_item_data)
-
-            models.append(models_item)
+        _models = src_dict.get("models", UNSET)
+        models = [ModelModel.from_dict(models_item_data) for models_item_data in _models or []]
 
         sync_models_form = cls(
             models=models,
         )
 
-        sync_models_form.additional_properties = d
+        sync_models_form.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN}
         return sync_models_form
 
     @property
@@ -1,15 +1,26 @@
+# Hand-tuned generated file: generate_client.sh restores it after regenerating (see HAND_TUNED there).
 import datetime
 from collections.abc import Mapping
-from typing import Any, TypeVar, Union, cast
+from typing import Any, TypeVar, Union
 
 from attrs import define as _attrs_define
 from attrs import field as _attrs_field
-from dateutil.parser import isoparse
 
-from ..types import UNSET, Unset
+from ..types import UNSET, Unset, json_dumps_bytes, parse_iso_date
 
 T = TypeVar("T", bound="UpdateProfileForm")
 
+# Keys consumed by from_dict; anything else is kept in additional_properties.
+_KNOWN = frozenset(
+    {
+        "profile_image_url",
+        "name",
+        "bio",
+        "gender",
+        "date_of_birth",
+    }
+)
+
 
 @_attrs_define
 class UpdateProfileForm:
@@ -30,88 +41,37 @@ class UpdateProfileForm:
     additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
-        profile_image_url = self.profile_image_url
-
-        name = self.name
-
-        bio: Union[None, Unset, str]
-        if isinstance(self.bio, Unset):
-            bio = UNSET
-        else:
-            bio = self.bio
-
-        gender: Union[None, Unset, str]
-        if isinstance(self.gender, Unset):
-            gender = UNSET
-        else:
-            gender = self.gender
-
-        date_of_birth: Union[None, Unset, str]
-        if isinstance(self.date_of_birth, Unset):
-            date_of_birth = UNSET
-        elif isinstance(self.date_of_birth, datetime.date):
-            date_of_birth = self.date_of_birth.isoformat()
-        else:
+        field_dict: dict[str, Any] = {
+            **self.additional_properties,
+            "profile_image_url": self.profile_image_url,
+            "name": self.name,
+        }
+        if self.bio is not UNSET:
+            field_dict["bio"] = self.bio
+        if self.gender is not UNSET:
+            field_dict["gender"] = self.gender
+        if self.date_of_birth is not UNSET:
             date_of_birth = self.date_of_birth
-
-        field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
-        field_dict.update(
-            {
-                "profile_image_url": profile_image_url,
-                "name": name,
-            }
-        )
-        if bio is not UNSET:
-            field_dict["bio"] = bio
-        if gender is not UNSET:
-            field_dict["gender"] = gender
-        if date_of_birth is not UNSET:
-            field_dict["date_of_birth"] = date_of_birth
+            field_dict["date_of_birth"] = (
+                date_of_birth.isoformat() if isinstance(date_of_birth, datetime.date) else date_of_birth
+            )
 
         return field_dict
 
+    def to_json_bytes(self) -> bytes:
+        return json_dumps_bytes(self.to_dict())
+
     @classmethod
     def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
-        d = dict(src_dict)
-        profile_image_url = d.pop("profile_image_url")
-
-        name = d.pop("name")
-
-        def _parse_bio(data: object) -> Union[None, Unset, str]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            return cast(Union[None, Unset, str], data)
-
-        bio = _parse_bio(d.pop("bio", UNSET))
-
-        def _parse_gender(data: object) -> Union[None, Unset, str]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            return cast(Union[None, Unset, str], data)
-
-        gender = _parse_gender(d.pop("gender", UNSET))
-
-        def _parse_date_of_birth(data: object) -> Union[None, Unset, datetime.date]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            try:
-                if not isinstance(data, str):
-                    raise TypeError()
-                date_of_birth_type_0 = isoparse(data).date()
-
-                return date_of_birth_type_0
-            except:  # noqa: E722
-                pass
-            return cast(Union[None, Unset, datetime.date], data)
-
-        date_of_birth = _parse_date_of_birth(d.pop("date_of_birth", UNSET))
+        profile_image_url = src_dict["profile_image_url"]
+
+        name = src_dict["name"]
+
+        bio = src_dict.get("bio", UNSET)
+
+        gender = src_dict.get("gender", UNSET)
+
+        date_of_birth = parse_iso_date(src_dict.get("date_of_birth", UNSET))
 
         update_profile_form = cls(
             profile_image_url=profile_image_url,
@@ -121,7 +81,7 @@ class UpdateProfileForm:
             date_of_birth=date_of_birth,
         )
 
-        update_profile_form.additional_properties = d
+        update_profile_form.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN}
         return update_profile_form
 
     @property
@@ -1,3 +1,4 @@
+# Hand-tuned generated file: generate_client.sh restores it after regenerating (see HAND_TUNED there).
 from collections.abc import Mapping
 from typing import TYPE_CHECKING, Any, TypeVar
 
@@ -47,12 +48,7 @@ class UserListResponse:
         from ..models.user_model import UserModel
 
         d = dict(src_dict)
-        users = []
-        _users = d.pop("users")
-        for users_item_data in _users:
-            users_item = UserModel.from_dict(users_item_data)
-
-            users.append(users_item)
+        users = UserModel.from_list(d.pop("users"))
 
         total = d.pop("total")
 
@@ -1,12 +1,13 @@
+# Hand-tuned generated file: generate_client.sh restores it after regenerating (see HAND_TUNED there).
 import datetime
-from collections.abc import Mapping
-from typing import TYPE_CHECKING, Any, TypeVar, Union, cast
+import functools
+from collections.abc import Iterable, Mapping
+from typing import TYPE_CHECKING, Any, TypeVar, Union
 
 from attrs import define as _attrs_define
 from attrs import field as _attrs_field
-from dateutil.parser import isoparse
 
-from ..types import UNSET, Unset
+from ..types import UNSET, Unset, parse_iso_date
 
 if TYPE_CHECKING:
     from ..models.user_model_info_type_0 import UserModelInfoType0
@@ -15,6 +16,53 @@ if TYPE_CHECKING:
 
 T = TypeVar("T", bound="UserModel")
 
+# Keys consumed by from_dict; anything else is kept in additional_properties.
+_KNOWN = frozenset(
+    {
+        "id",
+        "name",
+        "email",
+        "profile_image_url",
+        "last_active_at",
+        "updated_at",
+        "created_at",
+        "username",
+        "role",
+        "bio",
+        "gender",
+        "date_of_birth",
+        "info",
+        "settings",
+        "api_key",
+        "oauth_sub",
+    }
+)
+
+
+@functools.cache
+def _resolve_types() -> tuple[type["UserModelInfoType0"], type["UserSettings"]]:
+    # Nested model classes, imported on first use rather than at module scope
+    from ..models.user_model_info_type_0 import UserModelInfoType0
+    from ..models.user_settings import UserSettings
+
+    return UserModelInfoType0, UserSettings
+
+
+def _parse_info(data: Any, info_cls: type["UserModelInfoType0"]) -> Union["UserModelInfoType0", None, Unset]:
+    if isinstance(data, dict):
+        # UserModelInfoType0 only collects additional properties, so from_dict cannot fail on a dict
+        return info_cls.from_dict(data)
+    return data
+
+
+def _parse_settings(data: Any, settings_cls: type["UserSettings"]) -> Union["UserSettings", None, Unset]:
+    if isinstance(data, dict):
+        try:
+            return settings_cls.from_dict(data)
+        except (KeyError, ValueError, TypeError):
+            pass
+    return data
+
 
 @_attrs_define
 class UserModel:
@@ -57,230 +105,79 @@ class UserModel:
     additional_properties: dict[str, Any] = _attrs_field(init=False, factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
-        from ..models.user_model_info_type_0 import UserModelInfoType0
-        from ..models.user_settings import UserSettings
+        info_cls, settings_cls = _resolve_types()
+
+        field_dict: dict[str, Any] = {
+            **self.additional_properties,
+            "id": self.id,
+            "name": self.name,
+            "email": self.email,
+            "profile_image_url": self.profile_image_url,
+            "last_active_at": self.last_active_at,
+            "updated_at": self.updated_at,
+            "created_at": self.created_at,
+        }
+        if self.username is not UNSET:
+            field_dict["username"] = self.username
+        if self.role is not UNSET:
+            field_dict["role"] = self.role
+        if self.bio is not UNSET:
+            field_dict["bio"] = self.bio
+        if self.gender is not UNSET:
+            field_dict["gender"] = self.gender
+        if self.date_of_birth is not UNSET:
+            date_of_birth = self.date_of_birth
+            field_dict["date_of_birth"] = (
+                date_of_birth.isoformat() if isinstance(date_of_birth, datetime.date) else date_of_birth
+            )
+        if self.info is not UNSET:
+            info = self.info
+            field_dict["info"] = info.to_dict() if isinstance(info, info_cls) else info
+        if self.settings is not UNSET:
+            settings = self.settings
+            field_dict["settings"] = settings.to_dict() if isinstance(settings, settings_cls) else settings
+        if self.api_key is not UNSET:
+            field_dict["api_key"] = self.api_key
+        if self.oauth_sub is not UNSET:
+            field_dict["oauth_sub"] = self.oauth_sub
+
+        return field_dict
 
-        id = self.id
+    @classmethod
+    def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
+        info_cls, settings_cls = _resolve_types()
 
-        name = self.name
+        id = src_dict["id"]
 
-        email = self.email
+        name = src_dict["name"]
 
-        profile_image_url = self.profile_image_url
+        email = src_dict["email"]
 
-        last_active_at = self.last_active_at
+        profile_image_url = src_dict["profile_image_url"]
 
-        updated_at = self.updated_at
+        last_active_at = src_dict["last_active_at"]
 
-        created_at = self.created_at
+        updated_at = src_dict["updated_at"]
 
-        username: Union[None, Unset, str]
-        if isinstance(self.username, Unset):
-            username = UNSET
-        else:
-            username = self.username
+        created_at = src_dict["created_at"]
 
-        role = self.role
+        username = src_dict.get("username", UNSET)
 
-        bio: Union[None, Unset, str]
-        if isinstance(self.bio, Unset):
-            bio = UNSET
-        else:
-            bio = self.bio
+        role = src_dict.get("role", UNSET)
 
-        gender: Union[None, Unset, str]
-        if isinstance(self.gender, Unset):
-            gender = UNSET
-        else:
-            gender = self.gender
+        bio = src_dict.get("bio", UNSET)
 
-        date_of_birth: Union[None, Unset, str]
-        if isinstance(self.date_of_birth, Unset):
-            date_of_birth = UNSET
-        elif isinstance(self.date_of_birth, datetime.date):
-            date_of_birth = self.date_of_birth.isoformat()
-        else:
-            date_of_birth = self.date_of_birth
+        gender = src_dict.get("gender", UNSET)
 
-        info: Union[None, Unset, dict[str, Any]]
-        if isinstance(self.info, Unset):
-            info = UNSET
-        elif isinstance(self.info, UserModelInfoType0):
-            info = self.info.to_dict()
-        else:
-            info = self.info
+        date_of_birth = parse_iso_date(src_dict.get("date_of_birth", UNSET))
 
-        settings: Union[None, Unset, dict[str, Any]]
-        if isinstance(self.settings, Unset):
-            settings = UNSET
-        elif isinstance(self.settings, UserSettings):
-            settings = self.settings.to_dict()
-        else:
-            settings = self.settings
+        info = _parse_info(src_dict.get("info", UNSET), info_cls)
 
-        api_key: Union[None, Unset, str]
-        if isinstance(self.api_key, Unset):
-            api_key = UNSET
-        else:
-            api_key = self.api_key
-
-        oauth_sub: Union[None, Unset, str]
-        if isinstance(self.oauth_sub, Unset):
-            oauth_sub = UNSET
-        else:
-            oauth_sub = self.oauth_sub
-
-        field_dict: dict[str, Any] = {}
-        field_dict.update(self.additional_properties)
-        field_dict.update(
-            {
-                "id": id,
-                "name": name,
-                "email": email,
-                "profile_image_url": profile_image_url,
-                "last_active_at": last_active_at,
-                "updated_at": updated_at,
-                "created_at": created_at,
-            }
-        )
-        if username is not UNSET:
-            field_dict["username"] = username
-        if role is not UNSET:
-            field_dict["role"] = role
-        if bio is not UNSET:
-            field_dict["bio"] = bio
-        if gender is not UNSET:
-            field_dict["gender"] = gender
-        if date_of_birth is not UNSET:
-            field_dict["date_of_birth"] = date_of_birth
-        if info is not UNSET:
-            field_dict["info"] = info
-        if settings is not UNSET:
-            field_dict["settings"] = settings
-        if api_key is not UNSET:
-            field_dict["api_key"] = api_key
-        if oauth_sub is not UNSET:
-            field_dict["oauth_sub"] = oauth_sub
+        settings = _parse_settings(src_dict.get("settings", UNSET), settings_cls)
 
-        return field_dict
+        api_key = src_dict.get("api_key", UNSET)
 
-    @classmethod
-    def from_dict(cls: type[T], src_dict: Mapping[str, Any]) -> T:
-        from ..models.user_model_info_type_0 import UserModelInfoType0
-        from ..models.user_settings import UserSettings
-
-        d = dict(src_dict)
-        id = d.pop("id")
-
-        name = d.pop("name")
-
-        email = d.pop("email")
-
-        profile_image_url = d.pop("profile_image_url")
-
-        last_active_at = d.pop("last_active_at")
-
-        updated_at = d.pop("updated_at")
-
-        created_at = d.pop("created_at")
-
-        def _parse_username(data: object) -> Union[None, Unset, str]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            return cast(Union[None, Unset, str], data)
-
-        username = _parse_username(d.pop("username", UNSET))
-
-        role = d.pop("role", UNSET)
-
-        def _parse_bio(data: object) -> Union[None, Unset, str]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            return cast(Union[None, Unset, str], data)
-
-        bio = _parse_bio(d.pop("bio", UNSET))
-
-        def _parse_gender(data: object) -> Union[None, Unset, str]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            return cast(Union[None, Unset, str], data)
-
-        gender = _parse_gender(d.pop("gender", UNSET))
-
-        def _parse_date_of_birth(data: object) -> Union[None, Unset, datetime.date]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            try:
-                if not isinstance(data, str):
-                    raise TypeError()
-                date_of_birth_type_0 = isoparse(data).date()
-
-                return date_of_birth_type_0
-            except:  # noqa: E722
-                pass
-            return cast(Union[None, Unset, datetime.date], data)
-
-        date_of_birth = _parse_date_of_birth(d.pop("date_of_birth", UNSET))
-
-        def _parse_info(data: object) -> Union["UserModelInfoType0", None, Unset]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            try:
-                if not isinstance(data, dict):
-                    raise TypeError()
-                info_type_0 = UserModelInfoType0.from_dict(data)
-
-                return info_type_0
-            except:  # noqa: E722
-                pass
-            return cast(Union["UserModelInfoType0", None, Unset], data)
-
-        info = _parse_info(d.pop("info", UNSET))
-
-        def _parse_settings(data: object) -> Union["UserSettings", None, Unset]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            try:
-                if not isinstance(data, dict):
-                    raise TypeError()
-                settings_type_0 = UserSettings.from_dict(data)
-
-                return settings_type_0
-            except:  # noqa: E722
-                pass
-            return cast(Union["UserSettings", None, Unset], data)
-
-        settings = _parse_settings(d.pop("settings", UNSET))
-
-        def _parse_api_key(data: object) -> Union[None, Unset, str]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            return cast(Union[None, Unset, str], data)
-
-        api_key = _parse_api_key(d.pop("api_key", UNSET))
-
-        def _parse_oauth_sub(data: object) -> Union[None, Unset, str]:
-            if data is None:
-                return data
-            if isinstance(data, Unset):
-                return data
-            return cast(Union[None, Unset, str], data)
-
-        oauth_sub = _parse_oauth_sub(d.pop("oauth_sub", UNSET))
+        oauth_sub = src_dict.get("oauth_sub", UNSET)
 
         user_model = cls(
             id=id,
@@ -301,9 +198,14 @@ class UserModel:
             oauth_sub=oauth_sub,
         )
 
-        user_model.additional_properties = d
+        user_model.additional_properties = {k: v for k, v in src_dict.items() if k not in _KNOWN}
         return user_model
 
+    @classmethod
+    def from_list(cls: type[T], src_list: Iterable[Mapping[str, Any]]) -> list[T]:
+        from_dict = cls.from_dict
+        return [from_dict(src_dict) for src_dict in src_list]
+
     @property
     def additional_keys(self) -> list[str]:
         return list(self.additional_properties.keys())
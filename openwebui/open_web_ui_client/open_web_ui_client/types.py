@@ -1,10 +1,30 @@
+# Hand-tuned generated file: generate_client.sh restores it after regenerating (see HAND_TUNED there).
 """Contains some shared types for properties"""
 
-from collections.abc import Mapping, MutableMapping
+import datetime
+import functools
+import json
+from collections.abc import Callable, Mapping, MutableMapping
 from http import HTTPStatus
-from typing import IO, BinaryIO, Generic, Literal, Optional, TypeVar, Union
+from typing import IO, Any, BinaryIO, Generic, Literal, Optional, TypeVar, Union
 
 from attrs import define
+from dateutil.parser import isoparse
+
+
+def _stdlib_json_dumps_bytes(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# Prefer orjson for encoding models to JSON when it is installed, falling back to the stdlib.
+# OPT_NON_STR_KEYS makes orjson stringify int/float/bool/None dict keys the way json.dumps does.
+_json_dumps_bytes: Callable[[Any], bytes]
+try:
+    import orjson
+
+    _json_dumps_bytes = functools.partial(orjson.dumps, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    _json_dumps_bytes = _stdlib_json_dumps_bytes
 
 
 class Unset:
@@ -51,4 +71,32 @@ class Response(Generic[T]):
     parsed: Optional[T]
 
 
-__all__ = ["UNSET", "File", "FileTypes", "RequestFiles", "Response", "Unset"]
+def json_dumps_bytes(obj: Any) -> bytes:
+    """Encode a JSON-ready object (e.g. the output of a model's to_dict) as compact UTF-8 JSON bytes
+
+    Integers must fit in 64 bits: with orjson installed, larger ones raise a TypeError.
+    """
+    return _json_dumps_bytes(obj)
+
+
+@functools.lru_cache(maxsize=1024)
+def _iso_to_date(data: str) -> datetime.date:
+    # Responses repeat the same dates (e.g. user lists), so parsed results are memoized.
+    try:
+        return datetime.date.fromisoformat(data)
+    except ValueError:
+        # date.fromisoformat rejects full timestamps; fall back to dateutil for those.
+        return isoparse(data).date()
+
+
+def parse_iso_date(data: Any) -> Any:
+    """Parse an ISO 8601 date string into a datetime.date, returning anything else (None, UNSET, bad input) as is"""
+    if isinstance(data, str):
+        try:
+            return _iso_to_date(data)
+        except (ValueError, OverflowError):
+            pass
+    return data
+
+
+__all__ = ["UNSET", "File", "FileTypes", "RequestFiles", "Response", "Unset", "json_dumps_bytes", "parse_iso_date"]
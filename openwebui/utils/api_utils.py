@@ -1,6 +1,7 @@
-import logging
 import json
-from typing import Any
+import logging
+from collections.abc import Callable
+from typing import Any, Optional
 
 from httpx import Response
 
@@ -8,6 +9,46 @@ from ..exceptions import APIError, AuthenticationError, NotFoundError
 
 log = logging.getLogger(__name__)
 
+# Parse JSON bodies with orjson when it is installed, falling back to the stdlib
+_json_loads: Callable[[bytes], Any]
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Fixed messages for the 401/404 errors, built once rather than per raise
+_AUTH_ERR_MSG = "Invalid or missing API key."
+_NOT_FOUND_MSG = "The requested resource was not found."
+
+# Shared default for validation error details without a 'loc'; only ever formatted, never mutated
+_NO_LOC: list = []
+
+
+def _format_422(content: bytes) -> Optional[str]:
+    """
+    Summarizes the field errors in a 422 Unprocessable Entity response body.
+
+    Args:
+        content: The raw response body.
+
+    Returns:
+        Optional[str]: A "Validation Error (422): ..." message, or None if the body is not
+        a JSON object with a list of details, in which case the raw body should be used.
+    """
+    try:
+        error_details = _json_loads(content)
+    except ValueError:
+        return None  # Not a JSON error, use raw message for 422
+    if not isinstance(error_details, dict):
+        return None
+    details = error_details.get("detail")
+    if not isinstance(details, list):
+        return None
+    detail_str = "; ".join(f"{d.get('loc', _NO_LOC)}: {d.get('msg')}" for d in details)
+    return f"Validation Error (422): {detail_str}"
+
 
 def handle_api_response(response: Response, resource_name: str = "resource") -> Any:
     """
@@ -29,67 +70,71 @@ def handle_api_response(response: Response, resource_name: str = "resource") ->
         NotFoundError: If the API returns a 404 Not Found status.
         APIError: For other 4xx or 5xx status codes, or unparseable responses.
     """
-    log.debug(f"Received API response for {resource_name}: Status {response.status_code}")
+    status_code = response.status_code
+    # Fast path: a successful, parsed response is the common case and needs no logging
+    if 200 <= status_code < 300 and status_code != 204:
+        parsed = response.parsed
+        if parsed is not None:
+            return parsed
 
-    if 200 <= response.status_code < 300:
-        log.debug(f"Request for {resource_name} successful.")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Received API response for %s: Status %d", resource_name, status_code)
+
+    if 200 <= status_code < 300:
+        log.debug("Request for %s successful.", resource_name)
 
         # Case 1: Officially No Content (204)
-        if response.status_code == 204:
+        if status_code == 204:
             return True
 
-        # Case 2: Parsed content is valid
-        if response.parsed is not None:
-            return response.parsed
-
-        # Case 3: Parsing failed (response.parsed is None) but content IS present (e.g., JSON)
+        # Case 2: Parsing failed (response.parsed is None) but content IS present (e.g., JSON)
         # This is the temporary patch for generated client parsing issues.
-        if response.content is not None and len(response.content) > 0:
-            log.info(
-                f"API parsing for {resource_name} failed (response.parsed is None) "
-                f"but raw content is present. Returning raw content."
-            )
+        content = response.content
+        content_len = len(content) if content is not None else 0
+        if content_len > 0:
+            if log.isEnabledFor(logging.INFO):
+                log.info(
+                    "API parsing for %s failed (response.parsed is None) "
+                    "but raw content is present. Returning raw content.",
+                    resource_name,
+                )
             try:
-                # Attempt to decode as JSON if content-type suggests it
-                if "application/json" in response.headers.get("content-type", ""):
-                    return json.loads(response.content.decode("utf-8", errors="ignore"))
-                return json.loads(response.content.decode("utf-8", errors="ignore"))  # Fallback to raw string
-            except json.JSONDecodeError:
-                log.warning(f"Could not JSON decode raw content for {resource_name}.")
-                return response.content.decode("utf-8", errors="ignore")  # Fallback to raw string
-
-        # Case 4: No parsed content and no raw content (or empty raw content for 2xx)
-        if response.parsed is None and (response.content is None or len(response.content) == 0):
-            # This could be acceptable for some 2xx (e.g., 200 OK after update that returns no body)
-            # but might also indicate missing expected content.
-            log.warning(
-                f"No parsed content and no raw content for {resource_name}. Status {response.status_code}."
-            )
-            return True  # Assume success if no error code and no content.
+                # Both json and orjson parse bytes directly, so the body is only decoded on fallback
+                return _json_loads(content)
+            except ValueError:  # JSONDecodeError, or a body that is not valid UTF-8
+                log.warning("Could not JSON decode raw content for %s.", resource_name)
+                return content.decode("utf-8", errors="ignore")  # Fallback to raw string
+
+        # Case 3: No parsed content and no raw content (or empty raw content for 2xx)
+        # This could be acceptable for some 2xx (e.g., 200 OK after update that returns no body)
+        # but might also indicate missing expected content.
+        log.warning("No parsed content and no raw content for %s. Status %d.", resource_name, status_code)
+        return True  # Assume success if no error code and no content.
 
     # --- Error Handling ---
-    elif response.status_code == 401:
+    elif status_code == 401:
         log.error("Authentication failed. Check your API key.")
-        raise AuthenticationError("Invalid or missing API key.")
-    elif response.status_code == 404:
+        raise AuthenticationError(_AUTH_ERR_MSG)
+    elif status_code == 404:
         log.warning("Resource not found.")
-        raise NotFoundError("The requested resource was not found.")
+        raise NotFoundError(_NOT_FOUND_MSG)
     else:  # General 4xx or 5xx error
-        error_message = response.content.decode("utf-8", errors="ignore")
         # Enhance error message for validation errors
-        if response.status_code == 422:
-            try:
-                error_details = json.loads(error_message)
-                if isinstance(error_details, dict) and "detail" in error_details:
-                    details = error_details["detail"]
-                    if isinstance(details, list):
-                        detail_str = "; ".join([f"{d.get('loc', [])}: {d.get('msg')}" for d in details])
-                        error_message = f"Validation Error (422): {detail_str}"
-            except json.JSONDecodeError:
-                pass  # Not a JSON error, use raw message for 422
-
-        log.error(f"API Error {response.status_code}: {error_message}")
-        raise APIError(
-            message=f"Received unexpected status code: {response.status_code} for {resource_name}: {error_message}",
-            status_code=response.status_code,
+        error_message = _format_422(response.content) if status_code == 422 else None
+        if error_message is not None:
+            log.error("API Error %d: %s", status_code, error_message)
+            raise APIError(
+                message=f"Received unexpected status code: {status_code} for {resource_name}: {error_message}",
+                status_code=status_code,
+            )
+
+        # Pass the body through undecoded; APIError only decodes it when the error is displayed
+        error = APIError(
+            message=f"Received unexpected status code: {status_code} for {resource_name}",
+            status_code=status_code,
+            raw=response.content,
         )
+        log.error("API Error %d for %s.", status_code, resource_name)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("API Error %d response body: %s", status_code, error.body)
+        raise error
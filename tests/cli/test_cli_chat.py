@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, NonCallableMagicMock
 
 # Import the CLI application object
 from openwebui.cli.main import cli
@@ -7,12 +7,22 @@ from openwebui.cli.main import cli
 from openwebui.open_web_ui_client.open_web_ui_client import models
 
 
+def make_model_mock(cls, **attrs):
+    """
+    Builds a mock of a generated model instance with the given attributes set.
+
+    `spec_set` rejects attributes the model does not define, and a non-callable mock is
+    enough since the CLI only reads attributes from the SDK's return values.
+    """
+    return NonCallableMagicMock(spec_set=cls, **attrs)
+
+
 # --- Test Cases for Chat Commands ---
 
 
 def test_chat_create_cli_success(runner, mock_sdk_client):
     """Test `owui chat create` command for successful chat creation."""
-    mock_chat_response = MagicMock(spec=models.ChatResponse, id="new-chat-xyz", title="Test Chat")
+    mock_chat_response = make_model_mock(models.ChatResponse, id="new-chat-xyz", title="Test Chat")
     mock_chat_response.chat.additional_properties = {
         "messages": [
             {"role": "user", "content": "User prompt."},
@@ -31,7 +41,7 @@ def test_chat_create_cli_success(runner, mock_sdk_client):
 
 def test_chat_continue_cli_success(runner, mock_sdk_client):
     """Test `owui chat continue` command for successful chat continuation."""
-    mock_updated_chat = MagicMock(spec=models.ChatResponse, id="existing-chat-id", title="Continued Chat")
+    mock_updated_chat = make_model_mock(models.ChatResponse, id="existing-chat-id", title="Continued Chat")
     mock_updated_chat.chat.additional_properties = {
         "messages": [
             {"role": "user", "content": "Old user msg."},
@@ -52,7 +62,7 @@ def test_chat_continue_cli_success(runner, mock_sdk_client):
 
 def test_chat_list_messages_cli_success(runner, mock_sdk_client):
     """Test `owui chat list` command for successfully listing messages."""
-    mock_chat_details = MagicMock(spec=models.ChatResponse, title="My Chat Title")
+    mock_chat_details = make_model_mock(models.ChatResponse, title="My Chat Title")
     mock_chat_details.chat.additional_properties = {
         "messages": [
             {"role": "user", "content": "First user message."},
@@ -95,19 +105,18 @@ def test_chat_delete_cli_success(runner, mock_sdk_client):
     mock_sdk_client.chats.delete.assert_awaited_once_with(chat_id="chat-to-delete")
 
 
-def test_chat_delete_cli_aborted(runner, mock_sdk_client):
+def test_chat_delete_cli_aborted(runner, mock_sdk_client_minimal):
     """Test `owui chat delete` when user aborts."""
-    mock_sdk_client.chats.delete.return_value = False  # Or just not configure it
     result = runner.invoke(cli, ["chat", "delete", "doesnt-matter"], input="n\n")
 
     # FIX: Expect exit_code 1 due to click.Abort() in main.py
     assert result.exit_code == 1
     assert "Aborted." in result.output
-    mock_sdk_client.chats.delete.assert_not_awaited()
+    mock_sdk_client_minimal.chats.delete.assert_not_called()
 
 def test_chat_create_cli_with_rag_success(runner, mock_sdk_client):
     """Test `owui chat create` with RAG parameters."""
-    mock_chat_response = MagicMock(spec=models.ChatResponse, id="new-chat-rag", title="RAG Test Chat")
+    mock_chat_response = make_model_mock(models.ChatResponse, id="new-chat-rag", title="RAG Test Chat")
     mock_chat_response.chat.additional_properties = {
         "messages": [
             {"role": "user", "content": "User prompt about data."},
@@ -153,7 +162,7 @@ def test_chat_create_cli_with_rag_success(runner, mock_sdk_client):
 
 def test_chat_create_cli_with_rag_no_hybrid_success(runner, mock_sdk_client):
     """Test `owui chat create` with RAG parameters, explicitly no-hybrid."""
-    mock_chat_response = MagicMock(spec=models.ChatResponse, id="new-chat-no-hybrid", title="No Hybrid RAG Chat")
+    mock_chat_response = make_model_mock(models.ChatResponse, id="new-chat-no-hybrid", title="No Hybrid RAG Chat")
     mock_chat_response.chat.additional_properties = {
         "messages": [
             {"role": "user", "content": "Tell me something."},
@@ -191,7 +200,7 @@ def test_chat_create_cli_with_rag_no_hybrid_success(runner, mock_sdk_client):
 
 def test_chat_continue_cli_with_rag_success(runner, mock_sdk_client):
     """Test `owui chat continue` with RAG parameters."""
-    mock_updated_chat = MagicMock(spec=models.ChatResponse, id="existing-chat-id", title="Continued RAG Chat")
+    mock_updated_chat = make_model_mock(models.ChatResponse, id="existing-chat-id", title="Continued RAG Chat")
     mock_updated_chat.chat.additional_properties = {
         "messages": [
             {"role": "user", "content": "Previous msg."},
@@ -231,7 +240,7 @@ def test_chat_continue_cli_with_rag_success(runner, mock_sdk_client):
 
 def test_chat_continue_cli_with_no_rag_options(runner, mock_sdk_client):
     """Test `owui chat continue` with no RAG options (should pass None for options)."""
-    mock_updated_chat = MagicMock(spec=models.ChatResponse, id="existing-chat-id", title="No RAG options Chat")
+    mock_updated_chat = make_model_mock(models.ChatResponse, id="existing-chat-id", title="No RAG options Chat")
     mock_updated_chat.chat.additional_properties = {
         "messages": [
             {"role": "user", "content": "Previous msg."},
@@ -1,8 +1,10 @@
+import operator
 import pytest
-from unittest.mock import MagicMock
+from types import SimpleNamespace
+from unittest.mock import call
 
 # Import the CLI application object
-from openwebui.cli.main import cli  # Ensure this path is correct
+from openwebui.cli.main import _list_all_folders_async, _list_chats_in_folder_async, cli
 
 
 # --- Test Cases for Folder Commands ---
@@ -13,7 +15,7 @@ def test_folder_create_cli_success(runner, mock_sdk_client):
     """Test `owui folder create` command for successful folder creation."""
     # When mocking the return value, ensure nested objects match what the CLI expects to access.
     # The CLI expects .id and .name on the returned object.
-    mock_sdk_client.folders.create.return_value = MagicMock(id="new-folder-id", name="My New Folder")
+    mock_sdk_client.folders.create.return_value = SimpleNamespace(id="new-folder-id", name="My New Folder")
 
     result = runner.invoke(cli, ["folder", "create", "My New Folder"])
 
@@ -24,30 +26,11 @@ def test_folder_create_cli_success(runner, mock_sdk_client):
 
 def test_folder_list_cli_success(runner, mock_sdk_client):
     """Test `owui folder list` command with successful SDK call."""
-    # FIX: Ensure the 'name' attribute is a plain string, not a MagicMock object.
-    # The 'id' attribute should also be a string.
-    # We can create a simple object (like a types.SimpleNamespace or a dict-like mock)
-    # or ensure MagicMock's attributes are directly strings.
-
-    # Option 1: Use MagicMock, but explicitly set its string attributes
+    # Plain namespaces keep `.id` and `.name` as real strings. Note that `name` is a
+    # constructor argument of MagicMock itself, so it cannot be set through the constructor.
     mock_sdk_client.folders.list.return_value = [
-        MagicMock(id="folder1", name="Proj A"),  # 'name' here is a string
-        MagicMock(id="folder2", name="Team B"),  # 'name' here is a string
-    ]
-
-    # NOTE: Your current code is doing this, but the issue comes from
-    # Pytest's introspection or some subtle interaction.
-    # Let's try explicitly making sure its `.name` is a string.
-
-    # Let's try a different approach to ensure it prints as a string
-    class MockFolderItem:
-        def __init__(self, id, name):
-            self.id = id
-            self.name = name
-
-    mock_sdk_client.folders.list.return_value = [
-        MockFolderItem(id="folder1", name="Proj A"),
-        MockFolderItem(id="folder2", name="Team B"),
+        SimpleNamespace(id="folder1", name="Proj A"),
+        SimpleNamespace(id="folder2", name="Team B"),
     ]
 
     result = runner.invoke(cli, ["folder", "list"])
@@ -59,32 +42,50 @@ def test_folder_list_cli_success(runner, mock_sdk_client):
     mock_sdk_client.folders.list.assert_awaited_once()
 
 
-def test_folder_list_cli_empty(runner, mock_sdk_client):
-    """Test `owui folder list` command when no folders exist."""
-    mock_sdk_client.folders.list.return_value = []
-
-    result = runner.invoke(cli, ["folder", "list"])
-
-    assert result.exit_code == 0
-    assert "No folders found on the server." in result.output
-    mock_sdk_client.folders.list.assert_awaited_once()
-
-
-def test_folder_list_chats_cli_success(runner, mock_sdk_client):
-    """Test `owui folder list-chats` command with successful SDK call."""
-    # FIX: Ensure 'id' and 'title' attributes are plain strings.
-    mock_sdk_client.chats.list_by_folder.return_value = [
-        MagicMock(id="chat1", title="Meeting Notes"),
-        MagicMock(id="chat2", title="Task Brainstorm"),
-    ]
-
-    result = runner.invoke(cli, ["folder", "list-chats", "folder-abc"])
-
-    assert result.exit_code == 0
-    assert "Chats in folder 'folder-abc':" in result.output
-    assert "  - ID: chat1, Title: Meeting Notes" in result.output
-    assert "  - ID: chat2, Title: Task Brainstorm" in result.output
-    mock_sdk_client.chats.list_by_folder.assert_awaited_once_with(folder_id="folder-abc")
+@pytest.mark.parametrize(
+    "command, args, api_attr, return_value, expected_lines, expected_call",
+    [
+        pytest.param(
+            _list_all_folders_async,
+            (),
+            "folders.list",
+            [],
+            ["No folders found on the server."],
+            call(),
+            id="list-empty",
+        ),
+        pytest.param(
+            _list_chats_in_folder_async,
+            ("folder-abc",),
+            "chats.list_by_folder",
+            [
+                SimpleNamespace(id="chat1", title="Meeting Notes"),
+                SimpleNamespace(id="chat2", title="Task Brainstorm"),
+            ],
+            [
+                "Chats in folder 'folder-abc':",
+                "  - ID: chat1, Title: Meeting Notes",
+                "  - ID: chat2, Title: Task Brainstorm",
+            ],
+            call(folder_id="folder-abc"),
+            id="list-chats",
+        ),
+    ],
+)
+async def test_folder_list_commands(
+    mock_sdk_client, cli_ctx, capsys, command, args, api_attr, return_value, expected_lines, expected_call
+):
+    """Test the `owui folder` listing commands print the SDK results and call the SDK once."""
+    api_method = operator.attrgetter(api_attr)(mock_sdk_client)
+    api_method.return_value = return_value
+
+    await command(cli_ctx, *args)
+
+    output = capsys.readouterr().out
+    for line in expected_lines:
+        assert line in output
+    api_method.assert_awaited_once()
+    assert api_method.await_args == expected_call
 
 
 def test_folder_delete_cli_success(runner, mock_sdk_client):
@@ -98,11 +99,10 @@ def test_folder_delete_cli_success(runner, mock_sdk_client):
     mock_sdk_client.folders.delete.assert_awaited_once_with(folder_id="folder-to-delete")
 
 
-def test_folder_delete_cli_aborted(runner, mock_sdk_client):
+def test_folder_delete_cli_aborted(runner, mock_sdk_client_minimal):
     """Test `owui folder delete` when user aborts."""
-    mock_sdk_client.folders.delete.return_value = False
     result = runner.invoke(cli, ["folder", "delete", "doesnt-matter"], input="n\n")
 
     assert result.exit_code == 1
     assert "Aborted." in result.output
-    mock_sdk_client.folders.delete.assert_not_awaited()
+    mock_sdk_client_minimal.folders.delete.assert_not_called()
@@ -1,19 +1,26 @@
-from unittest.mock import MagicMock
+import json
+import operator
+from types import SimpleNamespace
+from unittest.mock import call
 
-# Import the CLI application object
-from openwebui.cli.main import cli
+import pytest
 
-# Import generated models as specs for mocks where appropriate
-from openwebui.open_web_ui_client.open_web_ui_client import models
+# Import the CLI application object and the async command implementations
+from openwebui.cli.main import (
+    _delete_all_files_async,
+    _list_kb_files_async,
+    _list_kbs_async,
+    _upload_dir_async,
+    _upload_file_async,
+    cli,
+    format_output,
+)
 
 
 def test_kb_create_cli_success(runner, mock_sdk_client):
     """Test `owui kb create` command for successful KB creation."""
     # The mock for this was already correct, no changes needed.
-    mock_kb_response = MagicMock(spec=models.KnowledgeResponse)
-    mock_kb_response.id = "new-kb-123"
-    mock_kb_response.name = "My New KB"
-    mock_kb_response.description = "A test knowledge base"
+    mock_kb_response = SimpleNamespace(id="new-kb-123", name="My New KB", description="A test knowledge base")
 
     mock_sdk_client.knowledge.create.return_value = mock_kb_response
     result = runner.invoke(cli, ["kb", "create", "My New KB", "--description", "A test knowledge base"])
@@ -24,106 +31,144 @@ def test_kb_create_cli_success(runner, mock_sdk_client):
     assert "ID:   new-kb-123" in result.output
 
 
-def test_kb_list_kbs_cli_success(runner, mock_sdk_client):
-    """Test `owui kb list-kbs` command with successful SDK call."""
-    # FIX: Explicitly create mock objects and set their attributes.
-    kb1 = MagicMock(spec=models.KnowledgeResponse)
-    kb1.id = "kb1"
-    kb1.name = "Proj Docs"
-    kb1.description = "Docs for proj A"
-
-    kb2 = MagicMock(spec=models.KnowledgeResponse)
-    kb2.id = "kb2"
-    kb2.name = "Team Data"
-    kb2.description = "Data for team B"
-
-    mock_kbs_list = [kb1, kb2]
-    mock_sdk_client.knowledge.list_all.return_value = mock_kbs_list
-
-    result = runner.invoke(cli, ["kb", "list-kbs"])
-
-    assert result.exit_code == 0
-    assert "Found Knowledge Bases:" in result.output
-    # Now the assertions will work because the .name attribute returns a string.
-    assert "Name: Proj Docs" in result.output
-    assert "Desc: Docs for proj A" in result.output
-    assert "Name: Team Data" in result.output
-
-
-def test_kb_list_kbs_cli_empty(runner, mock_sdk_client):
-    """Test `owui kb list-kbs` command when no KBs exist."""
-    # This test was already correct.
-    mock_sdk_client.knowledge.list_all.return_value = []
-    result = runner.invoke(cli, ["kb", "list-kbs"])
-    assert result.exit_code == 0
-    assert "No knowledge bases found on the server." in result.output
-
-
-def test_kb_list_files_cli_success(runner, mock_sdk_client):
-    """Test `owui kb list-files` command with successful SDK call."""
-    # FIX: Mock the nested structure correctly.
-    # Create a mock for the `meta` object that has an `additional_properties` attribute.
-    meta1 = MagicMock()
-    meta1.additional_properties = {"name": "doc.pdf", "collection_name": "kb/doc.pdf"}
-
-    meta2 = MagicMock()
-    meta2.additional_properties = {"name": "image.png", "collection_name": "kb/image.png"}
-
-    file1 = MagicMock(spec=models.FileMetadataResponse)
-    file1.id = "file1"
-    file1.meta = meta1
+@pytest.mark.parametrize(
+    "command, args, api_attr, return_value, expected_lines, expected_call",
+    [
+        pytest.param(
+            _list_kbs_async,
+            (),
+            "knowledge.list_all",
+            [
+                SimpleNamespace(id="kb1", name="Proj Docs", description="Docs for proj A"),
+                SimpleNamespace(id="kb2", name="Team Data", description="Data for team B"),
+            ],
+            ["Found Knowledge Bases:", "Name: Proj Docs", "Desc: Docs for proj A", "Name: Team Data"],
+            call(),
+            id="list-kbs",
+        ),
+        pytest.param(
+            _list_kbs_async,
+            (),
+            "knowledge.list_all",
+            [],
+            ["No knowledge bases found on the server."],
+            call(),
+            id="list-kbs-empty",
+        ),
+        pytest.param(
+            _list_kb_files_async,
+            ("kb-abc",),
+            "knowledge.list_files",
+            [
+                SimpleNamespace(
+                    id="file1",
+                    meta=SimpleNamespace(
+                        additional_properties={"name": "doc.pdf", "collection_name": "kb/doc.pdf"}
+                    ),
+                ),
+                SimpleNamespace(
+                    id="file2",
+                    meta=SimpleNamespace(
+                        additional_properties={"name": "image.png", "collection_name": "kb/image.png"}
+                    ),
+                ),
+            ],
+            ["Found 2 Files for KB 'kb-abc':", "Filename: doc.pdf", "Path:     kb/doc.pdf"],
+            call("kb-abc"),
+            id="list-files",
+        ),
+    ],
+)
+async def test_kb_list_commands(
+    mock_sdk_client, cli_ctx, capsys, command, args, api_attr, return_value, expected_lines, expected_call
+):
+    """Test the `owui kb` listing commands print the SDK results and call the SDK once."""
+    api_method = operator.attrgetter(api_attr)(mock_sdk_client)
+    api_method.return_value = return_value
+
+    await command(cli_ctx, *args)
+
+    output = capsys.readouterr().out
+    for line in expected_lines:
+        assert line in output
+    api_method.assert_awaited_once()
+    assert api_method.await_args == expected_call
+
+
+async def test_kb_list_files_cli_json_output(mock_sdk_client, cli_ctx, capsys):
+    """Test `owui --output json kb list-files` streams the files' metadata as a JSON list."""
+    meta = {"name": "doc.pdf", "collection_name": "kb/doc.pdf", "content_type": "application/pdf", "size": 3}
+    mock_sdk_client.knowledge.list_files.return_value = [
+        SimpleNamespace(id="file1", meta=SimpleNamespace(additional_properties=meta))
+    ]
 
-    file2 = MagicMock(spec=models.FileMetadataResponse)
-    file2.id = "file2"
-    file2.meta = meta2
+    cli_ctx.obj["OUTPUT_FORMAT"] = "json"
+    await _list_kb_files_async(cli_ctx, "kb-abc")
+
+    assert json.loads(capsys.readouterr().out) == [
+        {
+            "id": "file1",
+            "filename": "doc.pdf",
+            "filepath": "kb/doc.pdf",
+            "mime_type": "application/pdf",
+            "size": 3,
+            "meta_raw": meta,
+        }
+    ]
 
-    mock_sdk_client.knowledge.list_files.return_value = [file1, file2]
 
-    result = runner.invoke(cli, ["kb", "list-files", "kb-abc"])
+def test_format_output_text_materializes_generators(capsys):
+    """Test that text output prints a generator's items rather than its repr."""
+    format_output(({"id": i} for i in range(2)), "text")
 
-    assert result.exit_code == 0
-    assert "Found 2 Files for KB 'kb-abc':" in result.output
-    assert "Filename: doc.pdf" in result.output
-    assert "Path:     kb/doc.pdf" in result.output
+    assert capsys.readouterr().out == "[{'id': 0}, {'id': 1}]\n"
 
 
-def test_kb_upload_file_cli_success(runner, mock_sdk_client, tmp_path):
+async def test_kb_upload_file_cli_success(mock_sdk_client, cli_ctx, capsys, sample_upload_file):
     """Test `owui kb upload-file` command for successful file upload."""
-    # This test was already correct.
-    dummy_file = tmp_path / "upload_test.txt"
-    dummy_file.write_text("Hello, World!")
-
-    mock_uploaded_file_response = MagicMock(spec=models.FileModelResponse)
-    mock_uploaded_file_response.id = "uploaded-file-id"
-    mock_uploaded_file_response.filename = dummy_file.name
+    mock_uploaded_file_response = SimpleNamespace(id="uploaded-file-id", filename=sample_upload_file.name)
     mock_sdk_client.knowledge.upload_file.return_value = mock_uploaded_file_response
 
-    result = runner.invoke(cli, ["kb", "upload-file", str(dummy_file), "--kb-id", "kb-upload-target"])
+    await _upload_file_async(cli_ctx, str(sample_upload_file), "kb-upload-target")
 
-    assert result.exit_code == 0
     assert (
         "✅ Successfully uploaded 'upload_test.txt' (ID: uploaded-file-id) to KB 'kb-upload-target'."
-        in result.output
+        in capsys.readouterr().out
     )
 
 
-def test_kb_upload_dir_cli_success(runner, mock_sdk_client, tmp_path):
+async def test_kb_upload_dir_cli_success(mock_sdk_client, cli_ctx, capsys, sample_upload_dir):
     """Test `owui kb upload-dir` command for successful directory upload."""
-    (tmp_path / "subdir").mkdir()
-    (tmp_path / "file1.txt").write_text("content1")
-    (tmp_path / "subdir" / "file2.md").write_text("content2")
-
     mock_uploaded_files = [
-        MagicMock(spec=models.FileModelResponse, id="uploaded-file1-id", filename="file1.txt"),
-        MagicMock(spec=models.FileModelResponse, id="uploaded-file2-id", filename="file2.md"),
+        SimpleNamespace(id="uploaded-file1-id", filename="file1.txt"),
+        SimpleNamespace(id="uploaded-file2-id", filename="file2.md"),
     ]
     mock_sdk_client.knowledge.upload_directory.return_value = mock_uploaded_files
 
-    result = runner.invoke(cli, ["kb", "upload-dir", str(tmp_path), "--kb-id", "kb-dir-target"])
+    await _upload_dir_async(cli_ctx, str(sample_upload_dir), "kb-dir-target", None)
 
-    assert result.exit_code == 0
     # FIX: Use an f-string to check for the correct directory name.
-    assert f"✅ Successfully uploaded 2 files from '{tmp_path.name}' to KB 'kb-dir-target'." in result.output
+    assert (
+        f"✅ Successfully uploaded 2 files from '{sample_upload_dir.name}' to KB 'kb-dir-target'."
+        in capsys.readouterr().out
+    )
+
+
+async def test_kb_upload_dir_cli_json_output(mock_sdk_client, cli_ctx, capsys, sample_upload_dir):
+    """Test `owui --output json kb upload-dir` streams the uploaded files as a JSON list."""
+    mock_uploaded_files = [
+        SimpleNamespace(id="uploaded-file1-id", filename="file1.txt"),
+        SimpleNamespace(id="uploaded-file2-id", filename="file2.md"),
+    ]
+    mock_sdk_client.knowledge.upload_directory.return_value = mock_uploaded_files
+
+    cli_ctx.obj["OUTPUT_FORMAT"] = "json"
+    await _upload_dir_async(cli_ctx, str(sample_upload_dir), "kb-dir-target", None)
+
+    assert json.loads(capsys.readouterr().out) == [
+        {"id": "uploaded-file1-id", "filename": "file1.txt"},
+        {"id": "uploaded-file2-id", "filename": "file2.md"},
+    ]
 
 
 def test_kb_delete_file_cli_success(runner, mock_sdk_client):
@@ -135,26 +180,25 @@ def test_kb_delete_file_cli_success(runner, mock_sdk_client):
     assert "✅ Successfully deleted file with ID: file-to-delete-id." in result.output
 
 
-def test_kb_delete_file_cli_aborted(runner, mock_sdk_client):
+def test_kb_delete_file_cli_aborted(runner, mock_sdk_client_minimal):
     """Test `owui kb delete-file` command when user aborts."""
-    # This test was already correct.
-    mock_sdk_client.knowledge.delete_file.return_value = False
     result = runner.invoke(cli, ["kb", "delete-file", "file-id-ignored"], input="n\n")
     assert result.exit_code == 1
     assert "Aborted." in result.output
+    mock_sdk_client_minimal.knowledge.delete_file.assert_not_called()
 
 
-def test_kb_delete_all_files_cli_success(runner, mock_sdk_client):
+async def test_kb_delete_all_files_cli_success(mock_sdk_client, cli_ctx, capsys):
     """Test `owui kb delete-all-files` command with `--yes` flag."""
     mock_sdk_client.knowledge.delete_all_files_from_kb.return_value = {"successful": 5, "failed": 0}
 
-    result = runner.invoke(cli, ["kb", "delete-all-files", "kb-to-clear", "--yes"])
+    await _delete_all_files_async(cli_ctx, "kb-to-clear", True)
 
-    assert result.exit_code == 0
-    assert "✅ All files deleted successfully." in result.output
-    assert "Successfully deleted: 5" in result.output
+    output = capsys.readouterr().out
+    assert "✅ All files deleted successfully." in output
+    assert "Successfully deleted: 5" in output
     # FIX: Do not assert the "Failed" line when there are no failures.
-    assert "Failed to delete" not in result.output
+    assert "Failed to delete" not in output
 
 
 def test_kb_delete_all_files_cli_partial_failure(runner, mock_sdk_client):
@@ -1,23 +1,146 @@
+import base64
+import functools
+import hashlib
+import json
 import os
+import time
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+import httpx
 import pytest
+import pytest_asyncio
 from unittest.mock import MagicMock, AsyncMock
 from click.testing import CliRunner
-from dotenv import load_dotenv
 from openwebui.client import OpenWebUI
 from openwebui.exceptions import OpenWebUIError, NotFoundError
-from datetime import datetime
-import asyncio  # Make sure asyncio is imported at the top
 
 from openwebui.open_web_ui_client.open_web_ui_client import models
 
-# Load the main .env file to get the default URL
-load_dotenv()
-DEFAULT_SERVER_URL = os.getenv("OPENWEBUI_URL")
+
+@functools.lru_cache(maxsize=1)
+def _default_server_url() -> Optional[str]:
+    """
+    Returns the default server URL from OPENWEBUI_URL, read once and only when needed.
+
+    The `.env` file is already loaded by `openwebui.config` when the SDK is imported above,
+    so it is not parsed a second time here.
+    """
+    return os.getenv("OPENWEBUI_URL")
+
+
+# Record/replay of live HTTP traffic for integration tests, selected with OPENWEBUI_CACHE_MODE
+_CACHE_MODE = os.getenv("OPENWEBUI_CACHE_MODE", "").lower()
+_CACHE_DIR = Path(__file__).parent / ".http_cache"
+# Response headers that describe the wire encoding rather than the (already decoded) cached body
+_UNCACHED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+
+class RecordReplayTransport(httpx.AsyncBaseTransport):
+    """
+    An httpx transport that serves integration-test responses from an on-disk cache.
+
+    Each request is keyed by a SHA-256 of its method, URL and body plus how many times that
+    same request was already sent this session, and stored as `{key}.json` under `cache_dir`.
+    The occurrence count keeps repeated requests (e.g. polling a listing, or the same GET
+    before and after a change) apart, so each replays the response it got when recorded.
+    In "replay" mode a missing entry is an error, so no request ever reaches the network;
+    in "record" mode every request is forwarded to the real server and its entry overwritten.
+    """
+
+    def __init__(self, cache_dir: Path, mode: str):
+        self._cache_dir = cache_dir
+        self._inner: Optional[httpx.AsyncHTTPTransport] = (
+            httpx.AsyncHTTPTransport() if mode == "record" else None
+        )
+        self._occurrences: Counter = Counter()
+
+    def _cache_key(self, request: httpx.Request) -> str:
+        body = request.content
+        # Multipart boundaries are random per request; normalize them so uploads hash stably
+        content_type = request.headers.get("content-type", "")
+        if "boundary=" in content_type:
+            body = body.replace(content_type.split("boundary=", 1)[1].encode(), b"BOUNDARY")
+        digest = hashlib.sha256()
+        for part in (request.method.encode(), str(request.url).encode(), body):
+            digest.update(part)
+            digest.update(b"\0")
+        request_hash = digest.hexdigest()
+        occurrence = self._occurrences[request_hash]
+        self._occurrences[request_hash] += 1
+        return f"{request_hash}-{occurrence}"
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        path = self._cache_dir / f"{self._cache_key(request)}.json"
+        if self._inner is None:
+            if not path.exists():
+                raise httpx.ConnectError(
+                    f"No recorded response for {request.method} {request.url}; "
+                    "re-run with OPENWEBUI_CACHE_MODE=record against a live server.",
+                    request=request,
+                )
+            entry = json.loads(path.read_text())
+            return httpx.Response(
+                entry["status_code"],
+                headers=entry["headers"],
+                content=base64.b64decode(entry["content"]),
+                request=request,
+            )
+
+        response = await self._inner.handle_async_request(request)
+        content = await response.aread()
+        await response.aclose()
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _UNCACHED_HEADERS]
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "url": str(request.url),
+                    "status_code": response.status_code,
+                    "headers": headers,
+                    "content": base64.b64encode(content).decode("ascii"),
+                },
+                indent=2,
+            )
+        )
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self) -> None:
+        if self._inner is not None:
+            await self._inner.aclose()
+
+
+def _unique_suffix(request) -> str:
+    """
+    Returns a suffix for naming per-test server resources.
+
+    Live runs use the current time in nanoseconds. With a response cache the name must be identical
+    between recording and replay (it is part of the request body), so it is derived from
+    the test's node id instead.
+    """
+    if _CACHE_MODE in ("record", "replay"):
+        return hashlib.sha256(request.node.nodeid.encode()).hexdigest()[:16]
+    return str(time.time_ns())
+
 
 # Explicitly load the pytest_asyncio plugin for session scope fixtures
 pytest_plugins = ["pytest_asyncio"]
 
 
+def pytest_configure(config):
+    """
+    Imports the CLI module up front, before any test is timed.
+
+    The generated client models are already imported at the top of this file; the CLI
+    pulls in the rest of the import chain, which would otherwise be charged to the first
+    CLI test of each pytest-xdist worker.
+    """
+    import openwebui.cli.main  # noqa: F401
+
+
 def pytest_addoption(parser):
     """Adds a custom command-line option to pytest."""
     parser.addoption(
@@ -42,26 +165,74 @@ def server_url(request):
     if url_from_env:
         return url_from_env.rstrip("/")
 
-    if DEFAULT_SERVER_URL:
-        return DEFAULT_SERVER_URL.rstrip("/")
+    default_url = _default_server_url()
+    if default_url:
+        return default_url.rstrip("/")
 
     pytest.fail("Server URL not configured. Use --server-url, TEST_SERVER_URL, or OPENWEBUI_URL in .env.")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def runner():
-    """Provides a Click test runner instance for CLI tests."""
+    """
+    Provides a Click test runner instance for CLI tests.
+
+    CliRunner keeps no state between invoke() calls, so one instance is shared per session
+    (per worker under pytest-xdist).
+    """
     return CliRunner()
 
 
 # For SDK unit tests, we provide a real client but mock out the underlying HTTP calls.
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sdk_client():
-    """Provides an instance of the OpenWebUI SDK client for testing."""
+    """
+    Provides an instance of the OpenWebUI SDK client for testing, shared per session.
+
+    Construction does no I/O (the httpx client is only created on first request, which
+    the mocked tests never make), and tests patch its API calls through `mocker`, which
+    undoes them after each test, so one instance is safe to share.
+    """
     # FIX: Change server_url to base_url, as required by OpenWebUI.__init__
     return OpenWebUI(api_key="test_api_key", base_url="http://localhost:8080")
 
 
+@pytest.fixture
+def cli_ctx():
+    """
+    Provides a stand-in for the Click context passed to the CLI's async command implementations.
+
+    Tests can await e.g. `_list_kbs_async(cli_ctx)` directly instead of going through
+    `runner.invoke`; set `cli_ctx.obj["OUTPUT_FORMAT"] = "json"` to exercise JSON output.
+    """
+    return SimpleNamespace(obj={"OUTPUT_FORMAT": "text"})
+
+
+@pytest.fixture(scope="session")
+def sample_upload_dir(tmp_path_factory):
+    """
+    Provides a small directory tree for upload tests, built once per session.
+
+    Layout: `file1.txt` and `subdir/file2.md`, plus a `.kbignore` excluding `*.log` and an
+    `ignored.log` it excludes. Tests must treat it as read-only.
+    """
+    d = tmp_path_factory.mktemp("upload_fixture")
+    (d / "subdir").mkdir()
+    (d / "file1.txt").write_text("content1")
+    (d / "subdir" / "file2.md").write_text("content2")
+    (d / ".kbignore").write_text("*.log\n")
+    (d / "ignored.log").write_text("log content")
+    return d
+
+
+@pytest.fixture(scope="session")
+def sample_upload_file(tmp_path_factory):
+    """Provides a single `upload_test.txt` file for upload tests, written once per session."""
+    f = tmp_path_factory.mktemp("upload_file_fixture") / "upload_test.txt"
+    f.write_text("Hello, World!")
+    return f
+
+
 # For CLI unit tests, we mock out the OpenWebUI client entirely.
 @pytest.fixture
 def mock_sdk_client(mocker):
@@ -70,6 +241,7 @@ def mock_sdk_client(mocker):
 
     This fixture patches `openwebui.cli.main.OpenWebUI`
     so that CLI commands interact with an easily controllable mock.
+    A fresh mock tree is built for every test, so nothing a test configures can leak into the next.
     """
     # Create mocks for the high-level API modules (FoldersAPI, ChatsAPI)
     # Assign AsyncMock directly to the methods that are awaitable.
@@ -112,48 +284,58 @@ def mock_sdk_client(mocker):
     return mock_client_instance
 
 
+@pytest.fixture
+def mock_sdk_client_minimal(mocker):
+    """
+    Patches `openwebui.cli.main.OpenWebUI` with a bare MagicMock.
+
+    For tests that only exercise Click behaviour before any SDK call is made (e.g. a
+    declined confirmation prompt); use `mock_sdk_client` when SDK calls must be awaited.
+    """
+    mock_client_instance = MagicMock()
+    mocker.patch("openwebui.cli.main.OpenWebUI", return_value=mock_client_instance)
+    return mock_client_instance
+
+
 # For Integration tests, we need a live client that connects to a real server.
-@pytest.fixture(scope="session")
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def sdk_live_client(server_url):  # Uses the event loop managed by pytest_asyncio
     """
     Provides a live OpenWebUI SDK client for integration tests.
     Ensures the client is closed after all tests in the session.
+
+    With OPENWEBUI_CACHE_MODE=record responses are also saved under `tests/.http_cache/`;
+    with OPENWEBUI_CACHE_MODE=replay they are served from there without contacting the server.
     """
     api_key = os.getenv("OPENWEBUI_API_KEY")
     if not api_key:
-        pytest.fail("OPENWEBUI_API_KEY environment variable not set for integration tests.")
+        if _CACHE_MODE != "replay":
+            pytest.fail("OPENWEBUI_API_KEY environment variable not set for integration tests.")
+        api_key = "replay"  # Request headers are not part of the cache key
 
-    # Create the client instance and explicitly manage its lifecycle
-    # This pattern ensures the client is entered/exited within the fixture's scope,
-    # aligning with pytest_asyncio's loop management.
-    client = OpenWebUI(
-        base_url=server_url, api_key=api_key, timeout=60
-    )  # Increased timeout for live LLM calls
+    httpx_args = {}
+    if _CACHE_MODE in ("record", "replay"):
+        httpx_args["transport"] = RecordReplayTransport(_CACHE_DIR, _CACHE_MODE)
 
-    # Manually call __aenter__ to set up the client
-    await client.__aenter__()
-    try:
-        yield client  # Yield the client for the tests to use
-    finally:
-        # Manually call aclose to ensure httpx resources are released
-        # This is where the RuntimeError usually happens if the loop is considered closed too soon.
-        # Adding a small delay can sometimes help with race conditions, but ideal fix
-        # is to ensure the cleanup is ordered correctly by pytest_asyncio.
-        await asyncio.sleep(1)
-        await client.aclose()
+    # The fixture and the integration tests share the session event loop, so the client
+    # can be closed by the plain context manager without racing the loop teardown.
+    async with OpenWebUI(
+        base_url=server_url, api_key=api_key, timeout=60, httpx_args=httpx_args
+    ) as client:  # Increased timeout for live LLM calls
+        yield client
 
 
-@pytest.fixture(scope="function")
-async def test_folder_id(sdk_live_client):
+@pytest_asyncio.fixture(loop_scope="session")
+async def test_folder_id(sdk_live_client, request):
     """
     Creates a unique folder for a test function and cleans it up afterwards.
     """
-    folder_name = f"integration_test_folder_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    folder_name = f"integration_test_folder_{_unique_suffix(request)}"
     folder_obj = None
     try:
         folder_obj = await sdk_live_client.folders.create(name=folder_name)
-        # FIX: Access attributes using .get() notation for robustness
-        yield folder_obj.get("id")
+        # folders.create returns a models.FolderModel; accept a raw dict as well
+        yield folder_obj.get("id") if isinstance(folder_obj, dict) else folder_obj.id
     except OpenWebUIError as e:
         pytest.fail(f"Could not prepare test folder: {e}")
     finally:
@@ -172,13 +354,13 @@ async def test_folder_id(sdk_live_client):
                 print(f"\nWarning: Could not clean up folder {folder_obj.id}: {e}")
 
 
-@pytest.fixture(scope="function")
-async def test_kb_id(sdk_live_client):
+@pytest_asyncio.fixture(loop_scope="session")
+async def test_kb_id(sdk_live_client, request):
     """
     Creates a unique knowledge base for a test function and cleans it up afterwards.
     Yields the ID of the created knowledge base.
     """
-    kb_name = f"integration_test_kb_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    kb_name = f"integration_test_kb_{_unique_suffix(request)}"
     kb_obj = None
     try:
         # Create the knowledge base
@@ -1,78 +1,16 @@
+import asyncio
 import pytest
 import os
-from datetime import datetime
 
-from openwebui.client import OpenWebUI
 from openwebui.exceptions import OpenWebUIError, NotFoundError
 
-# Mark all tests in this file as async
-pytestmark = pytest.mark.asyncio
+# Live-server tests are opt-in: skip the whole module (and its live fixtures) unless
+# OPENWEBUI_LIVE is set or responses are being recorded/replayed (OPENWEBUI_CACHE_MODE).
+if not (os.getenv("OPENWEBUI_LIVE") or os.getenv("OPENWEBUI_CACHE_MODE")):
+    pytest.skip("Live server required; set OPENWEBUI_LIVE=1 to run.", allow_module_level=True)
 
-# Explicitly load the pytest_asyncio plugin for session scope fixtures
-pytest_plugins = ["pytest_asyncio"]
-
-
-@pytest.fixture(scope="session")
-async def sdk_live_client(server_url):  # Removed asyncio_loop as a direct dependency here
-    """
-    Provides a live OpenWebUI SDK client for integration tests.
-    Ensures the client is closed after all tests in the session.
-    """
-    # Use the server_url from conftest.py which pulls from env vars
-    api_key = os.getenv("OPENWEBUI_API_KEY")
-    if not api_key:
-        pytest.fail("OPENWEBUI_API_KEY environment variable not set for integration tests.")
-
-    # Initialize the client within the session's event loop context
-    # Use the 'async with client:' pattern to ensure proper aclose()
-    try:
-        # OpenWebUI itself is an async context manager, so passing it to this
-        # fixture will manage its lifecycle.
-        client = OpenWebUI(
-            base_url=server_url, api_key=api_key, timeout=60
-        )  # Increased timeout for live LLM calls
-        # We need to explicitly run __aenter__ because pytest's async fixtures
-        # expect the aenter/aexit to be handled within the fixture itself.
-        await client.__aenter__()
-        yield client  # Yield the client for the tests to use
-    finally:
-        # This ensures __aexit__ is called when the fixture tears down
-        await client.__aexit__(None, None, None)
-
-
-@pytest.fixture(scope="function")
-async def test_folder_id(sdk_live_client):
-    """
-    Creates a unique folder for a test function and cleans it up afterwards.
-    """
-    folder_name = f"integration_test_folder_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
-    folder_obj = None
-    try:
-        folder_obj = await sdk_live_client.folders.create(name=folder_name)
-        # FIX: Access attributes using .get() notation for robustness
-        # Cast to dict for type checker if your SDK is typed strictly and returns models.
-        # If folder_obj is an actual models.FolderModel (an attrs object), .id is correct.
-        if isinstance(folder_obj, dict):
-            yield folder_obj.get("id")
-        else:  # Assume it's a models.FolderModel
-            yield folder_obj.id
-    except OpenWebUIError as e:
-        pytest.fail(f"Could not prepare test folder: {e}")
-    finally:
-        # FIX: Access attributes using .get() notation for robustness during cleanup
-        # Need to check if it's a dict or an object
-        if isinstance(folder_obj, dict) and folder_obj.get("id"):
-            try:
-                await sdk_live_client.folders.delete(folder_obj.get("id"))
-                print(f"\nCleaned up folder: {folder_obj.get('id')}")
-            except OpenWebUIError as e:
-                print(f"\nWarning: Could not clean up folder {folder_obj.get('id')}: {e}")
-        elif hasattr(folder_obj, "id"):  # Fallback for models.FolderModel
-            try:
-                await sdk_live_client.folders.delete(folder_obj.id)
-                print(f"\nCleaned up folder: {folder_obj.id}")
-            except OpenWebUIError as e:
-                print(f"\nWarning: Could not clean up folder {folder_obj.id}: {e}")
+# Using the sdk_live_client and test_folder_id fixtures from conftest.py, so OPENWEBUI_CACHE_MODE
+# applies here too
 
 
 # --- Integration Test Scenarios ---
@@ -134,9 +72,12 @@ async def test_full_chat_workflow_with_folder(sdk_live_client, test_folder_id):
 
         print(f"Chat continued. Latest assistant content: {updated_response_content}")
 
-        # 3. List messages in the chat
+        # 3. List messages in the chat. The folder listing for step 5 does not depend on the
+        # rename in step 4 (only the chat ID is checked), so both GETs are issued together.
         print(f"\n--- Listing messages for chat '{chat_id}' ---")
-        fetched_chat = await sdk_live_client.chats.get(chat_id)
+        fetched_chat, chats_in_folder = await asyncio.gather(
+            sdk_live_client.chats.get(chat_id), sdk_live_client.chats.list_by_folder(folder_id)
+        )
         assert (fetched_chat.get("id") if isinstance(fetched_chat, dict) else fetched_chat.id) == chat_id
         messages_from_fetched_chat = (
             fetched_chat.get("chat", {}).get("additional_properties", {}).get("messages")
@@ -160,8 +101,8 @@ async def test_full_chat_workflow_with_folder(sdk_live_client, test_folder_id):
 
         # 5. Verify chat exists in folder
         print(f"\n--- Verifying chat '{chat_id}' in folder '{folder_id}' ---")
-        chats_in_folder = await sdk_live_client.chats.list_by_folder(folder_id)
-        assert any((c.get("id") if isinstance(c, dict) else c.id) == chat_id for c in chats_in_folder)
+        folder_chat_ids = {c["id"] if isinstance(c, dict) else c.id for c in chats_in_folder}
+        assert chat_id in folder_chat_ids
         print(f"Chat '{chat_id}' found in folder '{folder_id}'.")
 
     except Exception as e:
@@ -0,0 +1,80 @@
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+
+from openwebui.open_web_ui_client.open_web_ui_client.types import Response
+
+
+@pytest.fixture(scope="session")
+def make_response():
+    """
+    Provides a factory for generated-client `Response` objects returned by the mocked API calls.
+
+    A real (attrs) `Response` is cheaper to build than a `MagicMock(spec=Response)` and
+    carries exactly the fields `handle_api_response` reads.
+    """
+
+    def _mk(parsed=None, status=200, content=b"", headers=None):
+        return Response(status_code=HTTPStatus(status), content=content, headers=headers or {}, parsed=parsed)
+
+    return _mk
+
+
+@pytest.fixture(scope="session")
+def _chats_api_modules():
+    """Resolves the generated-client modules called by `ChatsAPI` once per session."""
+    from openwebui.api import chats
+
+    return SimpleNamespace(
+        get=chats.get_chat_by_id_api_v1_chats_id_get,
+        llm=chats.generate_chat_completion_openai_chat_completions_post,
+        create=chats.create_new_chat_api_v1_chats_new_post,
+        delete=chats.delete_chat_by_id_api_v1_chats_id_delete,
+        list=chats.get_session_user_chat_list_api_v1_chats_list_get,
+        update=chats.update_chat_by_id_api_v1_chats_id_post,
+    )
+
+
+@pytest.fixture
+def chat_api_mocks(mocker, _chats_api_modules):
+    """
+    Patches `asyncio_detailed` on each generated-client module used by `ChatsAPI`.
+
+    Tests set e.g. `chat_api_mocks.get.return_value = make_response(...)`. Patching the
+    pre-resolved module objects avoids resolving a dotted path string per patch.
+    """
+    return SimpleNamespace(
+        **{
+            name: mocker.patch.object(module, "asyncio_detailed")
+            for name, module in vars(_chats_api_modules).items()
+        }
+    )
+
+
+# Generated-client calls imported by `openwebui.api.knowledge`, keyed by their `knowledge_api_mocks` name
+_KNOWLEDGE_API_CALLS = {
+    "create": "create_kb_api_call",
+    "list_all": "list_kbs_api_call",
+    "upload_file": "upload_file_api_call",
+    "add_files": "add_files_to_knowledge_batch_api_call",
+    "delete_file": "delete_file_api_call",
+    "list_files": "list_files_for_knowledge_base_api_call",
+    "delete_kb": "delete_kb_api_call",
+    "query": "query_kb_api_call",
+}
+
+
+@pytest.fixture
+def knowledge_api_mocks(mocker):
+    """
+    Patches each generated-client call used by `KnowledgeBaseAPI`, the counterpart of `chat_api_mocks`.
+
+    Tests set e.g. `knowledge_api_mocks.query.return_value = make_response(...)`. The calls
+    are coroutine functions, so each patch is an `AsyncMock`.
+    """
+    from openwebui.api import knowledge
+
+    return SimpleNamespace(
+        **{name: mocker.patch.object(knowledge, attr) for name, attr in _KNOWLEDGE_API_CALLS.items()}
+    )
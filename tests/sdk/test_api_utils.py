@@ -0,0 +1,77 @@
+import pytest
+
+from openwebui.exceptions import APIError
+from openwebui.utils.api_utils import handle_api_response
+
+
+def test_handle_api_response_raw_json_fallback(make_response):
+    """Test that unparsed JSON content is returned as decoded JSON."""
+    response = make_response(content=b'{"id": "abc", "items": [1, 2]}')
+
+    assert handle_api_response(response, "thing") == {"id": "abc", "items": [1, 2]}
+
+
+def test_handle_api_response_raw_text_fallback(make_response):
+    """Test that unparsed non-JSON content is returned as a string."""
+    response = make_response(content=b"plain text")
+
+    assert handle_api_response(response, "thing") == "plain text"
+
+
+def test_handle_api_response_422_details(make_response):
+    """Test that 422 validation details are summarized in the APIError message."""
+    body = b'{"detail": [{"loc": ["body", "name"], "msg": "field required"}]}'
+    response = make_response(status=422, content=body)
+
+    with pytest.raises(
+        APIError, match=r"Validation Error \(422\): \['body', 'name'\]: field required"
+    ) as exc_info:
+        handle_api_response(response, "thing")
+    assert exc_info.value.status_code == 422
+
+
+def test_handle_api_response_returns_parsed_without_logging(mocker, make_response):
+    """Test that a parsed 2xx response is returned before any logging happens."""
+    debug_spy = mocker.patch("openwebui.utils.api_utils.log.debug")
+    parsed = object()
+
+    assert handle_api_response(make_response(parsed, content=b"{}"), "thing") is parsed
+    debug_spy.assert_not_called()
+
+
+def test_handle_api_response_204_returns_true(make_response):
+    """Test that a 204 No Content response is reported as success."""
+    assert handle_api_response(make_response(status=204), "thing") is True
+
+
+def test_handle_api_response_422_without_details_uses_raw_body(make_response):
+    """Test that a 422 body without a detail list falls back to the raw body text."""
+    response = make_response(status=422, content=b'{"detail": "bad input"}')
+
+    with pytest.raises(APIError, match='thing: {"detail": "bad input"}'):
+        handle_api_response(response, "thing")
+
+
+def test_handle_api_response_error_keeps_raw_body(make_response):
+    """Test that a generic error carries the undecoded body and still shows it in its message."""
+    response = make_response(status=500, content=b"<html>Internal Server Error</html>")
+
+    with pytest.raises(APIError) as exc_info:
+        handle_api_response(response, "thing")
+
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.raw == b"<html>Internal Server Error</html>"
+    assert str(exc_info.value) == (
+        "API Error 500: Received unexpected status code: 500 for thing: <html>Internal Server Error</html>"
+    )
+
+
+def test_handle_api_response_error_body_not_decoded_without_debug_logging(caplog, make_response):
+    """Test that an error body is only decoded for logging when DEBUG is enabled."""
+    response = make_response(status=500, content=b"<html>Internal Server Error</html>")
+
+    with caplog.at_level("INFO", logger="openwebui.utils.api_utils"), pytest.raises(APIError) as exc_info:
+        handle_api_response(response, "thing")
+
+    assert "body" not in vars(exc_info.value)  # The cached_property was never computed
+    assert "API Error 500 for thing." in caplog.text
@@ -0,0 +1,61 @@
+"""
+Tests for the hand-applied edits in the generated client (see HAND_TUNED in generate_client.sh).
+
+A plain regeneration drops these edits; these tests fail if that happens without the script.
+"""
+
+import datetime
+import json
+
+import pytest
+
+from openwebui.open_web_ui_client.open_web_ui_client import types
+from openwebui.open_web_ui_client.open_web_ui_client.models import UpdateProfileForm
+from openwebui.open_web_ui_client.open_web_ui_client.types import UNSET, json_dumps_bytes, parse_iso_date
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        pytest.param("1999-05-06", datetime.date(1999, 5, 6), id="date"),
+        pytest.param("2000-01-02T03:04:05Z", datetime.date(2000, 1, 2), id="timestamp"),
+        pytest.param("not-a-date", "not-a-date", id="invalid"),
+        pytest.param(None, None, id="none"),
+        pytest.param(UNSET, UNSET, id="unset"),
+    ],
+)
+def test_parse_iso_date(data, expected):
+    """Test that ISO dates and timestamps become dates and anything else is returned as is."""
+    assert parse_iso_date(data) == expected
+
+
+def test_update_profile_form_round_trip():
+    """Test from_dict date parsing, to_json_bytes encoding and value equality on a hand-tuned model."""
+    src = {"profile_image_url": "/img.png", "name": "Ada", "date_of_birth": "1999-05-06", "extra": 1}
+
+    form = UpdateProfileForm.from_dict(src)
+
+    assert form.date_of_birth == datetime.date(1999, 5, 6)
+    assert form["extra"] == 1
+    assert json.loads(form.to_json_bytes()) == src
+    assert form == UpdateProfileForm.from_dict(src)
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        pytest.param({"name": "Ada", "tags": ["a", "b"], "n": 1.5, "ok": True, "x": None}, id="plain"),
+        pytest.param({"name": "Zoë ✓"}, id="non-ascii"),
+        pytest.param({1: "a", 2.5: "b", False: "c", None: "d"}, id="non-str-keys"),
+    ],
+)
+def test_json_dumps_bytes_matches_stdlib(obj):
+    """Test that the installed JSON backend encodes exactly like the stdlib fallback."""
+    assert json_dumps_bytes(obj) == types._stdlib_json_dumps_bytes(obj)
+
+
+def test_json_dumps_bytes_orjson_rejects_big_ints():
+    """Test the documented orjson limit: integers wider than 64 bits raise a TypeError."""
+    pytest.importorskip("orjson")
+    with pytest.raises(TypeError):
+        json_dumps_bytes({"n": 2**64})
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from openwebui import config
+
+
+@pytest.fixture
+def isolated_config(monkeypatch, tmp_path):
+    """Points the config loader at temporary files and clears env vars and the config cache."""
+    user_config = tmp_path / "user" / "config.yaml"
+    local_config = tmp_path / "local" / "config.yaml"
+    user_config.parent.mkdir()
+    local_config.parent.mkdir()
+
+    monkeypatch.setattr(config, "DEFAULT_USER_CONFIG_PATH", str(user_config))
+    monkeypatch.setattr(config, "LOCAL_PROJECT_CONFIG_PATH", str(local_config))
+    monkeypatch.setattr(config, "_cached_config", None)
+    monkeypatch.delenv("OPENWEBUI_URL", raising=False)
+    monkeypatch.delenv("OPENWEBUI_API_KEY", raising=False)
+    return user_config, local_config
+
+
+def test_get_config_from_yaml(isolated_config):
+    """Test that the local project config overrides the user config."""
+    user_config, local_config = isolated_config
+    user_config.write_text("server:\n  url: http://user:8080/\n  api_key: user-key\n")
+    local_config.write_text("server:\n  url: http://local:8080/\n  api_key: local-key\n")
+
+    cfg = config.get_config()
+
+    assert cfg.server_url == "http://local:8080"
+    assert cfg.api_key == "local-key"
+
+
+def test_get_config_is_memoized(mocker, isolated_config):
+    """Test that repeated calls reuse the cached config until a config file changes."""
+    user_config, _ = isolated_config
+    user_config.write_text("server:\n  url: http://user:8080\n  api_key: user-key\n")
+    load_spy = mocker.spy(config, "_load_yaml_config")
+
+    first = config.get_config()
+    second = config.get_config()
+
+    assert first is second
+    assert load_spy.call_count == 1
+
+    user_config.write_text("server:\n  url: http://changed:8080\n  api_key: user-key\n")
+    stat = user_config.stat()
+    os.utime(user_config, (stat.st_atime, stat.st_mtime + 10))
+
+    assert config.get_config().server_url == "http://changed:8080"
+    assert load_spy.call_count == 2
+
+
+def test_get_config_missing_raises(isolated_config):
+    """Test that a ValueError is raised when no source provides a server URL."""
+    with pytest.raises(ValueError, match="server URL is not configured"):
+        config.get_config()
+
+
+def test_get_config_env_vars_skip_yaml(mocker, monkeypatch, isolated_config):
+    """Test that YAML files are not loaded when both environment variables are set."""
+    monkeypatch.setenv("OPENWEBUI_URL", "http://env:8080/")
+    monkeypatch.setenv("OPENWEBUI_API_KEY", "env-key")
+    load_spy = mocker.spy(config, "_load_yaml_config")
+
+    cfg = config.get_config()
+
+    assert cfg == config.Config(server_url="http://env:8080", api_key="env-key")
+    load_spy.assert_not_called()
+
+
+def test_get_config_invalid_yaml_raises(isolated_config):
+    """Test that a malformed YAML file is reported as a ValueError."""
+    user_config, _ = isolated_config
+    user_config.write_text("server: [unclosed\n")
+
+    with pytest.raises(ValueError, match="Error parsing YAML config file"):
+        config.get_config()
+
+
+def test_get_config_rejects_url_without_scheme(monkeypatch, isolated_config):
+    """Test that a server URL without an http(s) scheme is rejected."""
+    monkeypatch.setenv("OPENWEBUI_URL", "localhost:8080")
+    monkeypatch.setenv("OPENWEBUI_API_KEY", "env-key")
+
+    with pytest.raises(ValueError, match="must be an absolute http"):
+        config.get_config()
@@ -1,27 +1,20 @@
 import pytest
-from unittest.mock import MagicMock
 
+from openwebui.api import folders as folders_api
 from openwebui.exceptions import AuthenticationError, NotFoundError
 from openwebui.open_web_ui_client.open_web_ui_client import models
-from openwebui.open_web_ui_client.open_web_ui_client.types import Response
 
-# Mark all tests in this file as async
-pytestmark = pytest.mark.asyncio
 
-
-async def test_folders_list_success(mocker, sdk_client):
+async def test_folders_list_success(mocker, sdk_client, make_response):
     """Test successful folder listing."""
-    # Mock the generated client's function
-    mock_api_func = mocker.patch("openwebui.api.folders.get_folders.asyncio_detailed")
-
     # Simulate a successful API response
     mock_folder_list = [
         models.FolderModel(id="1", name="Test Folder", user_id="test_user", created_at=0, updated_at=0)
     ]
-    mock_response = MagicMock(spec=Response)
-    mock_response.status_code = 200
-    mock_response.parsed = mock_folder_list
-    mock_api_func.return_value = mock_response
+    # Mock the generated client's function
+    mock_api_func = mocker.patch.object(
+        folders_api.get_folders, "asyncio_detailed", return_value=make_response(parsed=mock_folder_list)
+    )
 
     # Call the SDK method
     folders = await sdk_client.folders.list()
@@ -32,30 +25,23 @@ async def test_folders_list_success(mocker, sdk_client):
     mock_api_func.assert_called_once()
 
 
-async def test_folders_list_auth_error(mocker, sdk_client):
+async def test_folders_list_auth_error(mocker, sdk_client, make_response):
     """Test folder listing with an authentication error."""
-    mock_api_func = mocker.patch("openwebui.api.folders.get_folders.asyncio_detailed")
-
     # Simulate a 401 Unauthorized response
-    mock_response = MagicMock(spec=Response)
-    mock_response.status_code = 401
-    mock_api_func.return_value = mock_response
+    mocker.patch.object(folders_api.get_folders, "asyncio_detailed", return_value=make_response(status=401))
 
     with pytest.raises(AuthenticationError):
         await sdk_client.folders.list()
 
 
-async def test_folder_create_success(mocker, sdk_client):
+async def test_folder_create_success(mocker, sdk_client, make_response):
     """Test successful folder creation."""
-    mock_api_func = mocker.patch("openwebui.api.folders.create_folder.asyncio_detailed")
-
     mock_folder = models.FolderModel(
         id="new-folder", name="New Folder", user_id="test_user", created_at=0, updated_at=0
     )
-    mock_response = MagicMock(spec=Response)
-    mock_response.status_code = 200
-    mock_response.parsed = mock_folder
-    mock_api_func.return_value = mock_response
+    mock_api_func = mocker.patch.object(
+        folders_api.create_folder, "asyncio_detailed", return_value=make_response(parsed=mock_folder)
+    )
 
     new_folder = await sdk_client.folders.create(name="New Folder")
 
@@ -67,14 +53,11 @@ async def test_folder_create_success(mocker, sdk_client):
     assert call_args["body"].name == "New Folder"
 
 
-async def test_folder_delete_success(mocker, sdk_client):
+async def test_folder_delete_success(mocker, sdk_client, make_response):
     """Test successful folder deletion."""
-    mock_api_func = mocker.patch("openwebui.api.folders.delete_folder_by_id.asyncio_detailed")
-
-    mock_response = MagicMock(spec=Response)
-    mock_response.status_code = 200
-    mock_response.parsed = True
-    mock_api_func.return_value = mock_response
+    mock_api_func = mocker.patch.object(
+        folders_api.delete_folder_by_id, "asyncio_detailed", return_value=make_response(parsed=True)
+    )
 
     success = await sdk_client.folders.delete(folder_id="folder-to-delete")
 
@@ -82,13 +65,11 @@ async def test_folder_delete_success(mocker, sdk_client):
     mock_api_func.assert_called_once_with(id="folder-to-delete", client=sdk_client._client)
 
 
-async def test_folder_delete_not_found(mocker, sdk_client):
+async def test_folder_delete_not_found(mocker, sdk_client, make_response):
     """Test deleting a folder that does not exist."""
-    mock_api_func = mocker.patch("openwebui.api.folders.delete_folder_by_id.asyncio_detailed")
-
-    mock_response = MagicMock(spec=Response)
-    mock_response.status_code = 404
-    mock_api_func.return_value = mock_response
+    mocker.patch.object(
+        folders_api.delete_folder_by_id, "asyncio_detailed", return_value=make_response(status=404)
+    )
 
     with pytest.raises(NotFoundError):
         await sdk_client.folders.delete(folder_id="non-existent-folder")
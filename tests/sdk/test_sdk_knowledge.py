@@ -1,34 +1,126 @@
+import asyncio
 import httpx
 import pytest
-from unittest.mock import MagicMock, AsyncMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 from openwebui.exceptions import APIError
 from openwebui.open_web_ui_client.open_web_ui_client import models  # Import generated models
-from openwebui.open_web_ui_client.open_web_ui_client.types import Response, UNSET
-import json  # Import json for json.dumps here
+from openwebui.open_web_ui_client.open_web_ui_client.types import UNSET
 from pathlib import Path  # Import Path from pathlib here
 
-# Mark all tests in this file as async
-pytestmark = pytest.mark.asyncio
+# Encode JSON payloads with orjson when it is installed (it returns bytes directly), falling back to the stdlib
+try:
+    from orjson import dumps as _json_bytes
+except ImportError:
+    import json
 
+    def _json_bytes(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
 
-async def test_knowledge_create_success(mocker, sdk_client):
+
+# Raw JSON bodies for the tests where `parsed` is None and the SDK decodes `content` itself.
+# Encoded once at import, since the payloads never change.
+_JSON_HEADERS = {b"content-type": b"application/json"}
+_RAW_KBS_LIST = _json_bytes(
+    [
+        {
+            "id": "kb-1",
+            "name": "KB One",
+            "description": "Desc 1",
+            "user_id": "u1",
+            "created_at": 1,
+            "updated_at": 1,
+        },
+        {
+            "id": "kb-2",
+            "name": "KB Two",
+            "description": "Desc 2",
+            "user_id": "u2",
+            "created_at": 2,
+            "updated_at": 2,
+        },
+    ]
+)
+_RAW_KBS_EMPTY = b"[]"
+_RAW_KB_FILES = _json_bytes(
+    {
+        "id": "test-kb-id",
+        "description": "desc",
+        "files": [
+            {
+                "id": "file1",
+                "created_at": 1,
+                "updated_at": 1,
+                "meta": {"name": "document1.pdf", "collection_name": "path/document1.pdf"},
+            },  # Direct dict for meta
+            {
+                "id": "file2",
+                "created_at": 2,
+                "updated_at": 2,
+                "meta": {"name": "report.docx", "collection_name": "path/report.docx"},
+            },  # Direct dict for meta
+            {
+                "id": "file3",
+                "created_at": 3,
+                "updated_at": 3,
+                "meta": {"name": "image.png", "collection_name": "path/image.png"},
+            },  # Direct dict for meta
+        ],
+    }
+)
+
+# Parsed response models shared by the tests below. Built once at import; the SDK only reads them.
+_KB_RESPONSE = models.KnowledgeResponse(
+    id="kb-123",
+    name="Test KB",
+    description="A test knowledge base.",
+    user_id="test_user_id",
+    created_at=1678886400,
+    updated_at=1678886400,
+)
+_UPLOADED_FILE_TEXT = "This is a test file content."
+_UPLOADED_FILE = models.FileModelResponse(
+    id="file-456",
+    user_id="test_user_id",
+    filename="test_document.txt",
+    meta={
+        "name": "test_document.txt",
+        "collection_name": "path/test_document.txt",
+        "content_type": "text/plain",
+        "size": len(_UPLOADED_FILE_TEXT),
+    },
+    created_at=1678886400,
+    updated_at=1678886400,
+)
+_DIR_UPLOADED_FILE1 = models.FileModelResponse(
+    id="file1-id",
+    user_id="test_user_id",
+    filename="file1.txt",
+    meta={"name": "file1.txt", "collection_name": "file1.txt", "content_type": "text/plain", "size": 8},
+    created_at=1,
+    updated_at=1,
+)
+_DIR_UPLOADED_FILE2 = models.FileModelResponse(
+    id="file2-id",
+    user_id="test_user_id",
+    filename="file2.md",
+    meta={
+        "name": "file2.md",
+        "collection_name": "subdir/file2.md",
+        "content_type": "text/markdown",
+        "size": 8,
+    },
+    created_at=2,
+    updated_at=2,
+)
+
+
+async def test_knowledge_create_success(sdk_client, make_response, knowledge_api_mocks):
     """Test successful creation of a knowledge base."""
     # Mock the low-level API call for creating a KB
-    mock_create_kb_api = mocker.patch("openwebui.api.knowledge.create_kb_api_call", new_callable=AsyncMock)
-
-    # Define the mock response object (models.KnowledgeBase)
-    # FIX: Use models.KnowledgeResponse if that's the correct model
-    mock_kb_response = models.KnowledgeResponse(  # Changed from KnowledgeBase
-        id="kb-123",
-        name="Test KB",
-        description="A test knowledge base.",
-        user_id="test_user_id",
-        created_at=1678886400,
-        updated_at=1678886400,
-    )
-    mock_response_object = MagicMock(spec=Response)
-    mock_response_object.status_code = 200
-    mock_response_object.parsed = mock_kb_response
+    mock_create_kb_api = knowledge_api_mocks.create
+
+    mock_response_object = make_response(parsed=_KB_RESPONSE)
     mock_create_kb_api.return_value = mock_response_object
 
     # Call the SDK method
@@ -47,13 +139,10 @@ async def test_knowledge_create_success(mocker, sdk_client):
     )
 
 
-async def test_knowledge_create_api_error(mocker, sdk_client):
+async def test_knowledge_create_api_error(sdk_client, make_response, knowledge_api_mocks):
     """Test APIError during knowledge base creation."""
-    mock_create_kb_api = mocker.patch("openwebui.api.knowledge.create_kb_api_call", new_callable=AsyncMock)
-    mock_response_object = MagicMock(spec=Response)
-    mock_response_object.status_code = 400
-    mock_response_object.content = b'{"detail": "Bad Request"}'
-    mock_response_object.parsed = None
+    mock_create_kb_api = knowledge_api_mocks.create
+    mock_response_object = make_response(status=400, content=b'{"detail": "Bad Request"}')
     mock_create_kb_api.return_value = mock_response_object
 
     with pytest.raises(APIError) as exc_info:
@@ -63,34 +152,12 @@ async def test_knowledge_create_api_error(mocker, sdk_client):
     assert "Bad Request" in str(exc_info.value)
 
 
-async def test_knowledge_list_all_success_parsed(mocker, sdk_client):
+async def test_knowledge_list_all_success_parsed(sdk_client, make_response, knowledge_api_mocks):
     """Test successful listing of knowledge bases when parsed is List[Model]."""
-    mock_list_kbs_api = mocker.patch("openwebui.api.knowledge.list_kbs_api_call", new_callable=AsyncMock)
+    mock_list_kbs_api = knowledge_api_mocks.list_all
 
     # Simulate raw API response data as if it were directly from the API.
-    raw_api_data = [
-        {
-            "id": "kb-1",
-            "name": "KB One",
-            "description": "Desc 1",
-            "user_id": "u1",
-            "created_at": 1,
-            "updated_at": 1,
-        },
-        {
-            "id": "kb-2",
-            "name": "KB Two",
-            "description": "Desc 2",
-            "user_id": "u2",
-            "created_at": 2,
-            "updated_at": 2,
-        },
-    ]
-    mock_response_object = MagicMock(spec=Response)
-    mock_response_object.status_code = 200
-    mock_response_object.parsed = None
-    mock_response_object.content = json.dumps(raw_api_data).encode("utf-8")
-    mock_response_object.headers = {b"content-type": b"application/json"}
+    mock_response_object = make_response(content=_RAW_KBS_LIST, headers=_JSON_HEADERS)
     mock_list_kbs_api.return_value = mock_response_object
 
     kbs = await sdk_client.knowledge.list_all()
@@ -98,21 +165,16 @@ async def test_knowledge_list_all_success_parsed(mocker, sdk_client):
     # Assertions
     assert isinstance(kbs, list)
     assert len(kbs) == 2
-    assert all(isinstance(kb, models.KnowledgeResponse) for kb in kbs)  # Changed from KnowledgeBase
+    assert {type(kb) for kb in kbs} == {models.KnowledgeResponse}
     assert kbs[0].id == "kb-1"
     assert kbs[1].name == "KB Two"
     mock_list_kbs_api.assert_awaited_once_with(client=sdk_client._client)
 
 
-async def test_knowledge_list_all_empty(mocker, sdk_client):
+async def test_knowledge_list_all_empty(sdk_client, make_response, knowledge_api_mocks):
     """Test listing all knowledge bases when none exist."""
-    mock_list_kbs_api = mocker.patch("openwebui.api.knowledge.list_kbs_api_call", new_callable=AsyncMock)
-    raw_api_data = []  # Empty list as string
-    mock_response_object = MagicMock(spec=Response)
-    mock_response_object.status_code = 200
-    mock_response_object.parsed = None
-    mock_response_object.content = json.dumps(raw_api_data).encode("utf-8")
-    mock_response_object.headers = {b"content-type": b"application/json"}
+    mock_list_kbs_api = knowledge_api_mocks.list_all
+    mock_response_object = make_response(content=_RAW_KBS_EMPTY, headers=_JSON_HEADERS)
     mock_list_kbs_api.return_value = mock_response_object
 
     kbs = await sdk_client.knowledge.list_all()
@@ -122,36 +184,19 @@ async def test_knowledge_list_all_empty(mocker, sdk_client):
     mock_list_kbs_api.assert_awaited_once()
 
 
-async def test_knowledge_upload_file_success(mocker, sdk_client, tmp_path):
+async def test_knowledge_upload_file_success(sdk_client, make_response, tmp_path, knowledge_api_mocks):
     """Test successful file upload and association with a KB."""
-    dummy_file = tmp_path / "test_document.txt"
+    dummy_file = tmp_path / _UPLOADED_FILE.filename
     with open(dummy_file, "w") as f:
-        f.write("This is a test file content.")
+        f.write(_UPLOADED_FILE_TEXT)
 
-    mock_upload_file_api = mocker.patch(
-        "openwebui.api.knowledge.upload_file_api_call", new_callable=AsyncMock
-    )
-    mock_add_files_to_kb_api = mocker.patch(
-        "openwebui.api.knowledge.add_files_to_knowledge_batch_api_call", new_callable=AsyncMock
-    )
+    mock_upload_file_api = knowledge_api_mocks.upload_file
+    mock_add_files_to_kb_api = knowledge_api_mocks.add_files
 
-    mock_uploaded_file = models.FileModelResponse(
-        id="file-456",
-        user_id="test_user_id",
-        filename=dummy_file.name,
-        meta={
-            "name": dummy_file.name,
-            "collection_name": "path/test_document.txt",
-            "content_type": "text/plain",
-            "size": len(dummy_file.read_bytes()),
-        },
-        created_at=1678886400,
-        updated_at=1678886400,
-    )
-    mock_upload_response = MagicMock(spec=Response, status_code=200, parsed=mock_uploaded_file)
+    mock_upload_response = make_response(parsed=_UPLOADED_FILE)
     mock_upload_file_api.return_value = mock_upload_response
 
-    mock_add_response = MagicMock(spec=Response, status_code=200, parsed=True)
+    mock_add_response = make_response(parsed=True)
     mock_add_files_to_kb_api.return_value = mock_add_response
 
     uploaded_file = await sdk_client.knowledge.upload_file(file_path=dummy_file, kb_id="some-kb-id")
@@ -174,73 +219,104 @@ async def test_knowledge_upload_file_not_found(sdk_client):
         await sdk_client.knowledge.upload_file(file_path=Path("non_existent_file.txt"), kb_id="some-kb-id")
 
 
-async def test_knowledge_upload_directory_success(mocker, sdk_client, tmp_path):
-    """Test successful directory upload with mock files."""
-    (tmp_path / "subdir").mkdir()
-    (tmp_path / "file1.txt").write_text("content1")
-    (tmp_path / "subdir" / "file2.md").write_text("content2")
-    (tmp_path / ".kbignore").write_text("*.log\n")
-    (tmp_path / "ignored.log").write_text("log content")
-
+async def test_knowledge_upload_directory_success(
+    mocker, sdk_client, make_response, sample_upload_dir, knowledge_api_mocks
+):
+    """Test successful directory upload with mock files; `ignored.log` is excluded by the `.kbignore`."""
     mock_upload_single_file_helper = mocker.patch(
         "openwebui.api.knowledge.KnowledgeBaseAPI._upload_single_file_for_batch", new_callable=AsyncMock
     )
-    mock_uploaded_file1 = models.FileModelResponse(
-        id="file1-id",
-        user_id="test_user_id",
-        filename="file1.txt",
-        meta={"name": "file1.txt", "collection_name": "file1.txt", "content_type": "text/plain", "size": 8},
-        created_at=1,
-        updated_at=1,
-    )
-    mock_uploaded_file2 = models.FileModelResponse(
-        id="file2-id",
-        user_id="test_user_id",
-        filename="file2.md",
-        meta={
-            "name": "file2.md",
-            "collection_name": "subdir/file2.md",
-            "content_type": "text/markdown",
-            "size": 8,
-        },
-        created_at=2,
-        updated_at=2,
-    )
+    # Dispatch on the path rather than call order, so the test does not depend on traversal order
+    uploads_by_path = {
+        sample_upload_dir / "file1.txt": _DIR_UPLOADED_FILE1,
+        sample_upload_dir / "subdir" / "file2.md": _DIR_UPLOADED_FILE2,
+    }
+    mock_upload_single_file_helper.side_effect = lambda path: uploads_by_path[path]
 
-    mock_upload_single_file_helper.side_effect = [
-        mock_uploaded_file1,
-        mock_uploaded_file2,
-    ]
+    mock_add_files_to_kb_api = knowledge_api_mocks.add_files
+    mock_add_files_to_kb_api.return_value = make_response(parsed=True)
 
-    mock_add_files_to_kb_api = mocker.patch(
-        "openwebui.api.knowledge.add_files_to_knowledge_batch_api_call", new_callable=AsyncMock
+    uploaded_files = await sdk_client.knowledge.upload_directory(
+        directory_path=sample_upload_dir, kb_id="test-kb-id"
     )
-    mock_add_files_to_kb_api.return_value = MagicMock(spec=Response, status_code=200, parsed=True)
-
-    uploaded_files = await sdk_client.knowledge.upload_directory(directory_path=tmp_path, kb_id="test-kb-id")
 
     assert isinstance(uploaded_files, list)
-    assert len(uploaded_files) == 2
-    assert uploaded_files[0].id == "file1-id"
-    assert uploaded_files[1].id == "file2-id"
+    assert {f.id for f in uploaded_files} == {"file1-id", "file2-id"}
 
     assert mock_upload_single_file_helper.call_count == 2
-    mock_upload_single_file_helper.assert_any_call(tmp_path / "file1.txt")
-    mock_upload_single_file_helper.assert_any_call(tmp_path / "subdir" / "file2.md")
+    mock_upload_single_file_helper.assert_any_call(sample_upload_dir / "file1.txt")
+    mock_upload_single_file_helper.assert_any_call(sample_upload_dir / "subdir" / "file2.md")
+
+    # Each file is registered with the KB as soon as its own upload completes.
+    assert mock_add_files_to_kb_api.await_count == 2
+    registered_ids = set()
+    for call in mock_add_files_to_kb_api.await_args_list:
+        assert call.kwargs["id"] == "test-kb-id"
+        assert call.kwargs["client"] is sdk_client._client
+        registered_ids.update(form.file_id for form in call.kwargs["body"])
+    assert registered_ids == {"file1-id", "file2-id"}
+
+
+async def test_knowledge_upload_directory_respects_max_concurrency(mocker, sdk_client, tmp_path):
+    """Test that upload_directory never has more than `max_concurrency` uploads in flight."""
+    for i in range(6):
+        (tmp_path / f"file{i}.txt").write_text(f"content{i}")
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_upload_and_register(file_path, kb_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return SimpleNamespace(id=f"{file_path.stem}-id", filename=file_path.name)
+
+    mocker.patch.object(
+        sdk_client.knowledge, "_upload_and_register_file", side_effect=fake_upload_and_register
+    )
 
-    mock_add_files_to_kb_api.assert_awaited_once_with(
-        id="test-kb-id",
-        body=[models.KnowledgeFileIdForm(file_id="file1-id"), models.KnowledgeFileIdForm(file_id="file2-id")],
-        client=sdk_client._client,
+    uploaded_files = await sdk_client.knowledge.upload_directory(tmp_path, "test-kb-id", max_concurrency=2)
+
+    assert len(uploaded_files) == 6
+    assert peak == 2
+
+
+@pytest.mark.parametrize("max_concurrency", [0, -1])
+async def test_knowledge_upload_directory_invalid_max_concurrency(
+    sdk_client, sample_upload_dir, max_concurrency
+):
+    """Test that a max_concurrency below 1 is rejected before anything is uploaded."""
+    with pytest.raises(ValueError, match="max_concurrency must be at least 1"):
+        await sdk_client.knowledge.upload_directory(
+            sample_upload_dir, "test-kb-id", max_concurrency=max_concurrency
+        )
+
+
+async def test_knowledge_upload_and_register_file_link_failure(
+    mocker, sdk_client, make_response, knowledge_api_mocks
+):
+    """Test that a file whose KB link fails is deleted again and the API error keeps its status."""
+    mocker.patch.object(
+        sdk_client.knowledge, "_upload_single_file_for_batch", return_value=_DIR_UPLOADED_FILE1
     )
+    knowledge_api_mocks.add_files.return_value = make_response(
+        status=400, content=b'{"detail": "Bad Request"}'
+    )
+    knowledge_api_mocks.delete_file.return_value = make_response(status=204)
+
+    with pytest.raises(APIError) as exc_info:
+        await sdk_client.knowledge._upload_and_register_file(Path("file1.txt"), "test-kb-id")
+
+    assert exc_info.value.status_code == 400
+    knowledge_api_mocks.delete_file.assert_awaited_once_with(id="file1-id", client=sdk_client._client)
 
 
-async def test_knowledge_delete_file_success(mocker, sdk_client):
+async def test_knowledge_delete_file_success(sdk_client, make_response, knowledge_api_mocks):
     """Test successful deletion of a file."""
-    mock_delete_file_api = mocker.patch(
-        "openwebui.api.knowledge.delete_file_api_call", new_callable=AsyncMock
-    )
-    mock_delete_response = MagicMock(spec=Response, status_code=204, parsed=None)
+    mock_delete_file_api = knowledge_api_mocks.delete_file
+    mock_delete_response = make_response(status=204)
     mock_delete_file_api.return_value = mock_delete_response
 
     success = await sdk_client.knowledge.delete_file(file_id="file-to-delete-id")
@@ -294,194 +370,162 @@ async def test_knowledge_delete_all_files_success(mocker, sdk_client):
     assert deletion_summary["failed"] == 0
     mock_list_files_api.assert_awaited_once_with(kb_id="test-kb-id")
     assert mock_delete_file_api.call_count == 2
-    mock_delete_file_api.assert_any_call("file1")
-    mock_delete_file_api.assert_any_call("file2")
+    assert {c.args[0] for c in mock_delete_file_api.call_args_list} == {"file1", "file2"}
 
-@pytest.mark.skip(reason="Broken test - needs investigation")
-async def test_knowledge_list_files_success(mocker, sdk_client):
-    """Test successful listing of files for a KB."""
-    mock_list_files_api_call = mocker.patch(
-        "openwebui.api.knowledge.list_files_for_knowledge_base_api_call", new_callable=AsyncMock
-    )
 
-    # Simulate raw API response data containing files
-    raw_api_data = {
-        "id": "test-kb-id",
-        "description": "desc",
-        "files": [
-            {
-                "id": "file1",
-                "created_at": 1,
-                "updated_at": 1,
-                "meta": {"name": "document1.pdf", "collection_name": "path/document1.pdf"},
-            },  # Direct dict for meta
-            {
-                "id": "file2",
-                "created_at": 2,
-                "updated_at": 2,
-                "meta": {"name": "report.docx", "collection_name": "path/report.docx"},
-            },  # Direct dict for meta
-            {
-                "id": "file3",
-                "created_at": 3,
-                "updated_at": 3,
-                "meta": {"name": "image.png", "collection_name": "path/image.png"},
-            },  # Direct dict for meta
-        ],
-    }
-    mock_response_object = MagicMock(spec=Response)
-    mock_response_object.status_code = 200
-    mock_response_object.parsed = None
-    mock_response_object.content = json.dumps(raw_api_data).encode("utf-8")
-    mock_response_object.headers = {b"content-type": b"application/json"}
-    mock_list_files_api_call.return_value = mock_response_object
-
-    files = await sdk_client.knowledge.list_files(kb_id="test-kb-id")
-
-    assert isinstance(files, list)
-    assert len(files) == 3
-    assert all(isinstance(f, models.FileMetadataResponse) for f in files)
-    assert files[0].id == "file1"
-    assert files[1].meta["name"] == "report.docx"  # FIX: Access meta as a dict directly
-    mock_list_files_api_call.assert_awaited_once_with(id="test-kb-id", client=sdk_client._client)
-
-
-@pytest.mark.asyncio
-async def test_knowledge_query_success_basic(mocker, sdk_client):
-    """Test successful basic query to a single knowledge base."""
-    mock_query_api_call = mocker.patch(
-        "openwebui.api.knowledge.query_kb_api_call", new_callable=AsyncMock
+async def test_knowledge_delete_files_bulk_with_ids(mocker, sdk_client):
+    """Test bulk deletion of explicit file IDs only deletes files of the KB and counts failures."""
+    mock_list_files_api = mocker.patch(
+        "openwebui.api.knowledge.KnowledgeBaseAPI.list_files", new_callable=AsyncMock
     )
+    mock_delete_file_api = mocker.patch(
+        "openwebui.api.knowledge.KnowledgeBaseAPI.delete_file", new_callable=AsyncMock
+    )
+    mock_list_files_api.return_value = [SimpleNamespace(id=f"file{i}") for i in range(1, 5)]
+    mock_delete_file_api.side_effect = [True, APIError("boom", 500), True]
 
-    # Simulate a successful retrieval response with content
-    mock_retrieved_chunks = [
-        {"content": "This is a test document snippet.", "meta": {"file": "test.txt"}},
-        {"content": "Another relevant piece of information.", "meta": {"file": "another.pdf"}},
-    ]
-    mock_response_object = MagicMock(spec=Response, status_code=200, parsed=mock_retrieved_chunks)
-    mock_query_api_call.return_value = mock_response_object
-
-    query_text = "What is the main topic?"
-    kb_ids = ["kb-id-1"]
-    k_value = 2
-
-    result_chunks = await sdk_client.knowledge.query(query_text, kb_ids, k=k_value)
-
-    # Assert that the low-level API was called with the correct QueryCollectionsForm
-    mock_query_api_call.assert_awaited_once()
-    call_args, call_kwargs = mock_query_api_call.call_args
-    assert isinstance(call_kwargs['body'], models.QueryCollectionsForm)
-    assert call_kwargs['body'].collection_names == kb_ids
-    assert call_kwargs['body'].query == query_text
-    assert call_kwargs['body'].k == k_value
-    assert call_kwargs['body'].k_reranker is UNSET
-    assert call_kwargs['body'].r is UNSET
-    assert call_kwargs['body'].hybrid is UNSET
-    assert call_kwargs['body'].hybrid_bm25_weight is UNSET
-
-    # Assert the returned data matches the mock response
-    assert isinstance(result_chunks, list)
-    assert len(result_chunks) == len(mock_retrieved_chunks)
-    assert result_chunks[0]["content"] == "This is a test document snippet."
-    assert result_chunks[1]["meta"]["file"] == "another.pdf"
+    deletion_summary = await sdk_client.knowledge.delete_files_bulk(
+        kb_id="test-kb-id", file_ids=["file1", "file2", "file3", "other-kb-file"]
+    )
 
+    # "other-kb-file" is not in the KB, so it is counted as failed without being deleted
+    assert deletion_summary == {"successful": 2, "failed": 2}
+    mock_list_files_api.assert_awaited_once_with(kb_id="test-kb-id")
+    assert {c.args[0] for c in mock_delete_file_api.call_args_list} == {"file1", "file2", "file3"}
 
-@pytest.mark.asyncio
-async def test_knowledge_query_success_multiple_kbs_and_all_rag_params(mocker, sdk_client):
-    """Test successful query to multiple knowledge bases with all RAG parameters."""
-    mock_query_api_call = mocker.patch(
-        "openwebui.api.knowledge.query_kb_api_call", new_callable=AsyncMock
-    )
 
-    mock_retrieved_chunks = [
-        {"content": "Content from KB A.", "meta": {"kb": "KB_A"}},
-        {"content": "Content from KB B.", "meta": {"kb": "KB_B"}},
-    ]
-    mock_response_object = MagicMock(spec=Response, status_code=200, parsed=mock_retrieved_chunks)
-    mock_query_api_call.return_value = mock_response_object
-
-    query_text = "Advanced RAG search"
-    kb_ids = ["kb-alpha", "kb-beta"]
-    k_value = 5
-    k_reranker_value = 3
-    r_value = 0.75
-    hybrid_value = True
-    hybrid_bm25_weight_value = 0.3
-
-    result_chunks = await sdk_client.knowledge.query(
-        query_text,
-        kb_ids,
-        k=k_value,
-        k_reranker=k_reranker_value,
-        r=r_value,
-        hybrid=hybrid_value,
-        hybrid_bm25_weight=hybrid_bm25_weight_value
+async def test_knowledge_delete_files_bulk_respects_max_concurrent_deletes(mocker, sdk_client):
+    """Test that delete_files_bulk never has more than MAX_CONCURRENT_DELETES deletions in flight."""
+    mocker.patch("openwebui.api.knowledge.MAX_CONCURRENT_DELETES", 2)
+    file_ids = [f"file{i}" for i in range(6)]
+    mocker.patch.object(
+        sdk_client.knowledge,
+        "list_files",
+        return_value=[SimpleNamespace(id=file_id) for file_id in file_ids],
     )
 
-    # Assert the low-level API was called with the correct QueryCollectionsForm
-    mock_query_api_call.assert_awaited_once()
-    call_args, call_kwargs = mock_query_api_call.call_args
-    assert isinstance(call_kwargs['body'], models.QueryCollectionsForm)
-    assert call_kwargs['body'].collection_names == kb_ids
-    assert call_kwargs['body'].query == query_text
-    assert call_kwargs['body'].k == k_value
-    assert call_kwargs['body'].k_reranker == k_reranker_value
-    assert call_kwargs['body'].r == r_value
-    assert call_kwargs['body'].hybrid == hybrid_value
-    assert call_kwargs['body'].hybrid_bm25_weight == hybrid_bm25_weight_value
+    in_flight = 0
+    peak = 0
 
-    assert isinstance(result_chunks, list)
-    assert len(result_chunks) == len(mock_retrieved_chunks)
+    async def fake_delete_file(file_id):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return True
 
+    mocker.patch.object(sdk_client.knowledge, "delete_file", side_effect=fake_delete_file)
 
-@pytest.mark.asyncio
-async def test_knowledge_query_empty_result(mocker, sdk_client):
-    """Test query returning an empty list of chunks."""
-    mock_query_api_call = mocker.patch(
-        "openwebui.api.knowledge.query_kb_api_call", new_callable=AsyncMock
-    )
-    # Simulate an empty retrieval result
-    mock_response_object = MagicMock(spec=Response, status_code=200, parsed=[])
-    mock_query_api_call.return_value = mock_response_object
+    deletion_summary = await sdk_client.knowledge.delete_files_bulk("test-kb-id", file_ids)
 
-    query_text = "Non-existent topic"
-    kb_ids = ["empty-kb"]
+    assert deletion_summary == {"successful": 6, "failed": 0}
+    assert peak == 2
 
-    result_chunks = await sdk_client.knowledge.query(query_text, kb_ids)
-
-    mock_query_api_call.assert_awaited_once()
-    assert result_chunks == []
 
+@pytest.mark.skip(reason="Broken test - needs investigation")
+async def test_knowledge_list_files_success(sdk_client, make_response, knowledge_api_mocks):
+    """Test successful listing of files for a KB."""
+    mock_list_files_api_call = knowledge_api_mocks.list_files
 
-@pytest.mark.asyncio
-async def test_knowledge_query_api_error(mocker, sdk_client):
-    """Test APIError during knowledge base query."""
-    mock_query_api_call = mocker.patch(
-        "openwebui.api.knowledge.query_kb_api_call", new_callable=AsyncMock
-    )
+    # Simulate raw API response data containing files
+    mock_response_object = make_response(content=_RAW_KB_FILES, headers=_JSON_HEADERS)
+    mock_list_files_api_call.return_value = mock_response_object
 
-    # Simulate an API error response (e.g., 400 Bad Request)
-    mock_bad_response = MagicMock(spec=Response, status_code=400, content=b'{"detail": "Invalid query"}')
-    mock_bad_response.parsed = None  # Ensure handle_api_response goes to raw content
-    mock_query_api_call.return_value = mock_bad_response
+    files = await sdk_client.knowledge.list_files(kb_id="test-kb-id")
 
-    query_text = "Error query"
-    kb_ids = ["invalid-kb"]
+    assert isinstance(files, list)
+    assert len(files) == 3
+    assert all(isinstance(f, models.FileMetadataResponse) for f in files)
+    assert files[0].id == "file1"
+    assert files[1].meta["name"] == "report.docx"  # FIX: Access meta as a dict directly
+    mock_list_files_api_call.assert_awaited_once_with(id="test-kb-id", client=sdk_client._client)
 
-    with pytest.raises(APIError) as exc_info:
-        await sdk_client.knowledge.query(query_text, kb_ids)
 
-    assert exc_info.value.status_code == 400
-    assert "Invalid query" in str(exc_info.value)
+@pytest.mark.parametrize(
+    "query_text, kb_ids, rag_kwargs, response_kwargs, expected_error",
+    [
+        pytest.param(
+            "What is the main topic?",
+            ["kb-id-1"],
+            {"k": 2},
+            {
+                "parsed": [
+                    {"content": "This is a test document snippet.", "meta": {"file": "test.txt"}},
+                    {"content": "Another relevant piece of information.", "meta": {"file": "another.pdf"}},
+                ]
+            },
+            None,
+            id="basic",
+        ),
+        pytest.param(
+            "Advanced RAG search",
+            ["kb-alpha", "kb-beta"],
+            {"k": 5, "k_reranker": 3, "r": 0.75, "hybrid": True, "hybrid_bm25_weight": 0.3},
+            {
+                "parsed": [
+                    {"content": "Content from KB A.", "meta": {"kb": "KB_A"}},
+                    {"content": "Content from KB B.", "meta": {"kb": "KB_B"}},
+                ]
+            },
+            None,
+            id="multiple-kbs-all-rag-params",
+        ),
+        pytest.param("Non-existent topic", ["empty-kb"], {}, {"parsed": []}, None, id="empty-result"),
+        # parsed stays None, so handle_api_response goes to the raw content
+        pytest.param(
+            "Error query",
+            ["invalid-kb"],
+            {},
+            {"status": 400, "content": b'{"detail": "Invalid query"}'},
+            "Invalid query",
+            id="api-error",
+        ),
+    ],
+)
+async def test_knowledge_query(
+    sdk_client,
+    make_response,
+    knowledge_api_mocks,
+    query_text,
+    kb_ids,
+    rag_kwargs,
+    response_kwargs,
+    expected_error,
+):
+    """Test that query() sends the RAG parameters in a QueryCollectionsForm and returns chunks or raises."""
+    mock_query_api_call = knowledge_api_mocks.query
+    mock_query_api_call.return_value = make_response(**response_kwargs)
+
+    if expected_error:
+        with pytest.raises(APIError) as exc_info:
+            await sdk_client.knowledge.query(query_text, kb_ids, **rag_kwargs)
+
+        assert exc_info.value.status_code == response_kwargs["status"]
+        assert expected_error in str(exc_info.value)
+        mock_query_api_call.assert_awaited_once()
+        return
+
+    result_chunks = await sdk_client.knowledge.query(query_text, kb_ids, **rag_kwargs)
+
+    # Assert that the low-level API was called with the correct QueryCollectionsForm;
+    # RAG parameters that were not passed must be left UNSET
     mock_query_api_call.assert_awaited_once()
+    body = mock_query_api_call.call_args.kwargs["body"]
+    assert isinstance(body, models.QueryCollectionsForm)
+    assert body.collection_names == kb_ids
+    assert body.query == query_text
+    for field in ("k", "k_reranker", "r", "hybrid", "hybrid_bm25_weight"):
+        assert getattr(body, field) == rag_kwargs.get(field, UNSET)
+
+    # Assert the returned data matches the mock response
+    assert isinstance(result_chunks, list)
+    assert result_chunks == response_kwargs["parsed"]
 
 
-@pytest.mark.asyncio
-async def test_knowledge_query_connection_error(mocker, sdk_client):
+async def test_knowledge_query_connection_error(sdk_client, knowledge_api_mocks):
     """Test ConnectionError during knowledge base API call."""
-    mock_query_api_call = mocker.patch(
-        "openwebui.api.knowledge.query_kb_api_call", new_callable=AsyncMock
-    )
+    mock_query_api_call = knowledge_api_mocks.query
     # Simulate a network connection error
     mock_query_api_call.side_effect = httpx.ConnectError("Connection refused")
 
@@ -492,4 +536,4 @@ async def test_knowledge_query_connection_error(mocker, sdk_client):
         await sdk_client.knowledge.query(query_text, kb_ids)
 
     assert "Connection refused" in str(exc_info.value)
-    mock_query_api_call.assert_awaited_once()
\ No newline at end of file
+    mock_query_api_call.assert_awaited_once()